@@ -0,0 +1,128 @@
+import asyncio
+import itertools
+from collections import defaultdict
+from enum import IntEnum
+
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+
+settings = get_settings()
+
+
+class AdmissionPriority(IntEnum):
+    HIGH = 0
+    LOW = 1
+
+
+class AdmissionController:
+    """Worker-wide concurrency budget shared by the auth routes.
+
+    Each route is also capped by its own limit, so expensive bcrypt routes can
+    never take the whole budget. A request with headroom on its route is
+    admitted at once unless a waiter of the same or higher priority could
+    take the slot. Waiting requests are admitted by priority, each route may
+    have at most `max_waiting` waiters so bcrypt waiters cannot crowd out
+    cheap routes, and overflowing or timed out requests are rejected with 503
+    and Retry-After instead of piling up.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_waiting: int,
+        wait_timeout: float,
+        retry_after: int,
+    ):
+        self.capacity = capacity
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.route_in_flight: dict[str, int] = defaultdict(int)
+        self._waiters: list[tuple] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, route: str, limit: int, priority: AdmissionPriority):
+        if self._has_room(route, limit) and not self._is_claimed(priority):
+            self._enter(route)
+            return
+        if self._waiting_for(route) >= self.max_waiting:
+            self._reject()
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._counter), route, limit, future)
+        self._waiters.append(waiter)
+        self._wake()
+        try:
+            await asyncio.wait_for(future, self.wait_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self._reject()
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            if future.done() and not future.cancelled():
+                self.release(route)
+            raise
+
+    def release(self, route: str):
+        self.in_flight -= 1
+        self.route_in_flight[route] -= 1
+        self._wake()
+
+    def _has_room(self, route: str, limit: int) -> bool:
+        return self.in_flight < self.capacity and self.route_in_flight[route] < limit
+
+    def _is_claimed(self, priority: AdmissionPriority) -> bool:
+        return any(
+            waiter_priority <= priority
+            and not future.done()
+            and self._has_room(route, limit)
+            for waiter_priority, _, route, limit, future in self._waiters
+        )
+
+    def _waiting_for(self, route: str) -> int:
+        return sum(1 for waiter in self._waiters if waiter[2] == route)
+
+    def _enter(self, route: str):
+        self.in_flight += 1
+        self.route_in_flight[route] += 1
+
+    def _wake(self):
+        for waiter in sorted(self._waiters):
+            if self.in_flight >= self.capacity:
+                break
+            _, _, route, limit, future = waiter
+            if not future.done() and self._has_room(route, limit):
+                self._enter(route)
+                future.set_result(None)
+        self._waiters = [waiter for waiter in self._waiters if not waiter[-1].done()]
+
+    def _discard(self, waiter: tuple):
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def _reject(self):
+        AppExceptions.service_unavailable_exception(
+            "Server is busy, try again later.", retry_after=self.retry_after
+        )
+
+
+admission_controller = AdmissionController(
+    capacity=settings.ADMISSION_CAPACITY,
+    max_waiting=settings.ADMISSION_MAX_WAITING,
+    wait_timeout=settings.ADMISSION_WAIT_TIMEOUT_SECONDS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+
+def admit(route: str, limit: int, priority: AdmissionPriority):
+    """Dependency factory holding an admission slot for the whole request."""
+
+    async def admission():
+        await admission_controller.acquire(route, limit, priority)
+        try:
+            yield
+        finally:
+            admission_controller.release(route)
+
+    return admission
@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
 
     DATABASE_URL: str = settings.REAL_DATABASE_URL
+    DATABASE_REPLICA_URL: str = settings.DATABASE_REPLICA_URL
     TEST_DATABASE_URL: str = settings.TEST_DATABASE_URL
 
     APP_PORT: int = settings.APP_PORT
@@ -17,8 +18,89 @@ class Settings(BaseSettings):
     SECRET_KEY_FOR_ACCESS: str = settings.SECRET_KEY_FOR_ACCESS
     SECRET_KEY_FOR_REFRESH: str = settings.SECRET_KEY_FOR_REFRESH
     ALGORITHM: str = settings.ALGORITHM
+    JWT_BACKEND: str = settings.JWT_BACKEND
+    JWT_KEYS_DIR: str = settings.JWT_KEYS_DIR
+    JWT_ACTIVE_KID: str = settings.JWT_ACTIVE_KID
+    JWT_KEYS_RELOAD_INTERVAL_SECONDS: float = settings.JWT_KEYS_RELOAD_INTERVAL_SECONDS
+    JWKS_MAX_AGE_SECONDS: int = settings.JWKS_MAX_AGE_SECONDS
     ACCESS_TOKEN_EXPIRE_MINUTES: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES
     REFRESH_TOKEN_EXPIRE_DAYS: int = settings.REFRESH_TOKEN_EXPIRE_DAYS
+    REFRESH_TOKEN_CACHE_SIZE: int = settings.REFRESH_TOKEN_CACHE_SIZE
+    REFRESH_TOKEN_MAINTENANCE_INTERVAL_SECONDS: float = (
+        settings.REFRESH_TOKEN_MAINTENANCE_INTERVAL_SECONDS
+    )
+    REFRESH_TOKEN_ALLOW_LEGACY: bool = settings.REFRESH_TOKEN_ALLOW_LEGACY
+    FORWARD_AUTH_PATH: str = settings.FORWARD_AUTH_PATH
+    INTROSPECTION_CACHE_SIZE: int = settings.INTROSPECTION_CACHE_SIZE
+    INTROSPECTION_CACHE_TTL_SECONDS: float = settings.INTROSPECTION_CACHE_TTL_SECONDS
+    INTROSPECTION_MAX_BATCH: int = settings.INTROSPECTION_MAX_BATCH
+    INTROSPECTION_CLIENTS: str = settings.INTROSPECTION_CLIENTS
+    INTROSPECTION_RATE_LIMIT_PER_IP: int = settings.INTROSPECTION_RATE_LIMIT_PER_IP
+    ACCESS_TOKEN_MODE: str = settings.ACCESS_TOKEN_MODE
+    REFERENCE_TOKEN_BYTES: int = settings.REFERENCE_TOKEN_BYTES
+    REFERENCE_TOKEN_CACHE_SIZE: int = settings.REFERENCE_TOKEN_CACHE_SIZE
+    REFERENCE_TOKEN_CACHE_TTL_SECONDS: float = (
+        settings.REFERENCE_TOKEN_CACHE_TTL_SECONDS
+    )
+    REFERENCE_TOKEN_PURGE_INTERVAL_SECONDS: float = (
+        settings.REFERENCE_TOKEN_PURGE_INTERVAL_SECONDS
+    )
+    ACCESS_TOKEN_CLAIMS: str = settings.ACCESS_TOKEN_CLAIMS
+    DB_ROUND_TRIP_INSTRUMENTATION: bool = settings.DB_ROUND_TRIP_INSTRUMENTATION
+    DB_POOL_SIZE: int = settings.DB_POOL_SIZE
+    DB_MAX_OVERFLOW: int = settings.DB_MAX_OVERFLOW
+    DB_POOL_TIMEOUT_SECONDS: float = settings.DB_POOL_TIMEOUT_SECONDS
+    DB_POOL_RECYCLE_SECONDS: int = settings.DB_POOL_RECYCLE_SECONDS
+    DB_POOL_PRE_PING: bool = settings.DB_POOL_PRE_PING
+    METRICS_CLIENTS: str = settings.METRICS_CLIENTS
+    REPLICA_MAX_LAG_SECONDS: float = settings.REPLICA_MAX_LAG_SECONDS
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = (
+        settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+    )
+    USER_CACHE_SIZE: int = settings.USER_CACHE_SIZE
+    USER_CACHE_TTL_SECONDS: float = settings.USER_CACHE_TTL_SECONDS
+    USER_CACHE_STALE_SECONDS: float = settings.USER_CACHE_STALE_SECONDS
+    USER_CHANGE_LISTENER_INTERVAL_SECONDS: float = (
+        settings.USER_CHANGE_LISTENER_INTERVAL_SECONDS
+    )
+    DECODED_TOKEN_CACHE_SIZE: int = settings.DECODED_TOKEN_CACHE_SIZE
+    TOKEN_VERSION_CACHE_SIZE: int = settings.TOKEN_VERSION_CACHE_SIZE
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = settings.TOKEN_VERSION_CACHE_TTL_SECONDS
+
+    HASHING_POOL_SIZE: int = settings.HASHING_POOL_SIZE
+    HASHING_QUEUE_SIZE: int = settings.HASHING_QUEUE_SIZE
+    HASHING_TIMEOUT_SECONDS: float = settings.HASHING_TIMEOUT_SECONDS
+    BCRYPT_ROUNDS: int = settings.BCRYPT_ROUNDS
+    PASSWORD_HASH_SCHEMES: str = settings.PASSWORD_HASH_SCHEMES
+    HASHING_CALIBRATE_ON_STARTUP: bool = settings.HASHING_CALIBRATE_ON_STARTUP
+    HASHING_TARGET_VERIFY_MS: float = settings.HASHING_TARGET_VERIFY_MS
+    REHASH_BATCH_SIZE: int = settings.REHASH_BATCH_SIZE
+    REHASH_FLUSH_INTERVAL_SECONDS: float = settings.REHASH_FLUSH_INTERVAL_SECONDS
+    REHASH_QUEUE_SIZE: int = settings.REHASH_QUEUE_SIZE
+
+    ADMISSION_CAPACITY: int = settings.ADMISSION_CAPACITY
+    ADMISSION_MAX_WAITING: int = settings.ADMISSION_MAX_WAITING
+    ADMISSION_WAIT_TIMEOUT_SECONDS: float = settings.ADMISSION_WAIT_TIMEOUT_SECONDS
+    ADMISSION_RETRY_AFTER_SECONDS: int = settings.ADMISSION_RETRY_AFTER_SECONDS
+    LOGIN_CONCURRENCY_LIMIT: int = settings.LOGIN_CONCURRENCY_LIMIT
+    SIGNUP_CONCURRENCY_LIMIT: int = settings.SIGNUP_CONCURRENCY_LIMIT
+
+    RATE_LIMIT_ENABLED: bool = settings.RATE_LIMIT_ENABLED
+    RATE_LIMIT_BACKEND: str = settings.RATE_LIMIT_BACKEND
+    RATE_LIMIT_MAX_KEYS: int = settings.RATE_LIMIT_MAX_KEYS
+    RATE_LIMIT_WINDOW_SECONDS: int = settings.RATE_LIMIT_WINDOW_SECONDS
+    LOGIN_RATE_LIMIT_PER_IP: int = settings.LOGIN_RATE_LIMIT_PER_IP
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = settings.LOGIN_RATE_LIMIT_PER_EMAIL
+    SIGNUP_RATE_LIMIT_PER_IP: int = settings.SIGNUP_RATE_LIMIT_PER_IP
+    SIGNUP_RATE_LIMIT_PER_EMAIL: int = settings.SIGNUP_RATE_LIMIT_PER_EMAIL
+    TRUST_FORWARDED_FOR: bool = settings.TRUST_FORWARDED_FOR
+
+    LOGIN_LOCKOUT_THRESHOLD: int = settings.LOGIN_LOCKOUT_THRESHOLD
+    LOGIN_LOCKOUT_BASE_SECONDS: int = settings.LOGIN_LOCKOUT_BASE_SECONDS
+    LOGIN_LOCKOUT_MAX_SECONDS: int = settings.LOGIN_LOCKOUT_MAX_SECONDS
+    LOGIN_LOCKOUT_RESET_SECONDS: int = settings.LOGIN_LOCKOUT_RESET_SECONDS
+    LOGIN_LOCKOUT_MAX_ENTRIES: int = settings.LOGIN_LOCKOUT_MAX_ENTRIES
+    LOGIN_LOCKOUT_PERSIST: bool = settings.LOGIN_LOCKOUT_PERSIST
 
 
 @lru_cache()
@@ -1,13 +1,31 @@
+import hmac
+from uuid import UUID
+
 from fastapi import Depends
+from fastapi.security import HTTPBasic
+from fastapi.security import HTTPBasicCredentials
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from api.core.principal import Principal
+from api.v1.auth.services.ReferenceTokenStore import is_reference_token
+from api.v1.auth.services.ReferenceTokenStore import reference_token_store
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.auth.services.UserCache import user_cache
 from api.v1.users.actions import get_user_by_email_action
+from api.v1.users.actions import get_user_by_id_action
+from db.models import User
 from db.session import async_session
+from db.session import replica_reads_enabled
+from utils.denylist import access_token_denylist
 from utils.jwt import JWT
 
+settings = get_settings()
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/token")
+client_scheme = HTTPBasic(auto_error=False)
 
 
 async def get_session():
@@ -19,13 +37,117 @@ async def get_session():
         await session.close()
 
 
+async def decode_access_token(token: str, session: AsyncSession) -> dict:
+    """Claims of a JWT or reference access token, 401 if it is not valid."""
+    if is_reference_token(token):
+        payload = await reference_token_store.resolve(token, session)
+        if payload is None:
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+    else:
+        payload = await JWT.decode_jwt_token(token, "access")
+    if payload.get("jti") in access_token_denylist:
+        AppExceptions.unauthorized_exception("Could not validate credentials")
+    return payload
+
+
+async def get_token_user(
+    payload: dict, session: AsyncSession, user_id: UUID | None = None
+) -> User | None:
+    """User the access token was issued to, looked up by `user_id` or else by
+    the `sub` email. Reads go to the user cache and then to the replica while
+    it is healthy. A missing user, or a token version the cache or the
+    replica has not caught up with, is re-read from the primary."""
+
+    async def load(replica: bool) -> User | None:
+        if user_id is None:
+            return await get_user_by_email_action(
+                payload.get("sub"), session, replica=replica
+            )
+        return await get_user_by_id_action(user_id, session, replica=replica)
+
+    replica = replica_reads_enabled()
+    user = await load(replica)
+    if user is None:
+        return await load(replica=False) if replica else None
+    if user.token_version == payload.get("ver", 0):
+        return user
+    # Drop the stale row so the primary's one replaces it
+    user_cache.forget(user.user_id)
+    if user in session:
+        session.expunge(user)
+    return await load(replica=False)
+
+
 async def get_current_user_from_access_token(
     token: str = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_session),
 ):
-    payload = await JWT.decode_jwt_token(token, "access")
+    payload = await decode_access_token(token, session)
     email: str = payload.get("sub")
-    user = await get_user_by_email_action(email=email, session=session)
+    if email is None:
+        # Compact claims identify the user by id only
+        try:
+            user_id = UUID(payload["user_id"])
+        except (KeyError, TypeError, ValueError):
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+        user = await get_token_user(payload, session, user_id)
+    else:
+        user = await get_token_user(payload, session)
     if user is None:
         AppExceptions.unauthorized_exception("Could not validate credentials")
+    token_version_service.ensure_matches_user(payload, user)
     return user
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_session),
+) -> Principal:
+    """Claims-only alternative to `get_current_user_from_access_token`.
+
+    The database is only queried for tokens issued without `user_id` and
+    `roles` claims. Use the DB-backed dependency where fresh user state matters.
+    """
+    payload = await decode_access_token(token, session)
+    principal = Principal.from_claims(payload)
+    if principal is None:
+        user = await get_token_user(payload, session)
+        if user is None:
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+        token_version_service.ensure_matches_user(payload, user)
+        return Principal.from_user(user)
+    await token_version_service.ensure_current(payload, principal.user_id, session)
+    return principal
+
+
+def client_auth(clients_setting: str):
+    """Dependency factory returning the id of an HTTP Basic client listed in
+    the setting named `clients_setting`, as comma separated client_id:secret
+    pairs. Everyone else gets 401."""
+
+    def authenticate_client(
+        credentials: HTTPBasicCredentials | None = Depends(client_scheme),
+    ) -> str:
+        if credentials is not None:
+            for client in getattr(settings, clients_setting).split(","):
+                client_id, _, secret = client.strip().partition(":")
+                if (
+                    client_id
+                    and secret
+                    and hmac.compare_digest(
+                        credentials.username.encode(), client_id.encode()
+                    )
+                    and hmac.compare_digest(
+                        credentials.password.encode(), secret.encode()
+                    )
+                ):
+                    return client_id
+        AppExceptions.unauthorized_exception("Could not authenticate client", "Basic")
+
+    return authenticate_client
+
+
+# Resource servers introspecting tokens, RFC 7662 requires client auth
+authenticate_introspection_client = client_auth("INTROSPECTION_CLIENTS")
+# Scrapers of /metrics, which exposes pool state and every other metric
+authenticate_metrics_client = client_auth("METRICS_CLIENTS")
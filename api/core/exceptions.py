@@ -13,10 +13,13 @@ class AppExceptions:
         raise HTTPException(status_code=400, detail=message)
 
     @staticmethod
-    def unauthorized_exception(message: str = "Incorrect username or password"):
+    def unauthorized_exception(
+        message: str = "Incorrect username or password", scheme: str | None = None
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=message,
+            headers={"WWW-Authenticate": scheme} if scheme else None,
         )
 
     @staticmethod
@@ -40,12 +43,22 @@ class AppExceptions:
         raise HTTPException(status_code=422, detail=message)
 
     @staticmethod
-    def service_unavailable_exception(message: str):
-        raise HTTPException(status_code=503, detail=message)
+    def too_many_requests_exception(message: str, retry_after: int | None = None):
+        headers = {"Retry-After": str(retry_after)} if retry_after else None
+        raise HTTPException(status_code=429, detail=message, headers=headers)
+
+    @staticmethod
+    def service_unavailable_exception(message: str, retry_after: int | None = None):
+        headers = {"Retry-After": str(retry_after)} if retry_after else None
+        raise HTTPException(status_code=503, detail=message, headers=headers)
 
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     logger.warning(
         f"HTTP Exception: {exc.detail}, Status: {exc.status_code}, Path: {request.url}"
     )
-    return JSONResponse(content={"detail": exc.detail}, status_code=exc.status_code)
+    return JSONResponse(
+        content={"detail": exc.detail},
+        status_code=exc.status_code,
+        headers=exc.headers,
+    )
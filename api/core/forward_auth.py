@@ -0,0 +1,103 @@
+from fastapi import HTTPException
+from starlette.types import ASGIApp
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from api.core.config import get_settings
+from api.core.principal import Principal
+from api.v1.auth.services.ReferenceTokenStore import is_reference_token
+from api.v1.auth.services.ReferenceTokenStore import reference_token_store
+from api.v1.auth.services.TokenVersionService import token_version_service
+from db.session import async_session
+from utils.denylist import access_token_denylist
+from utils.jwt import JWT
+
+settings = get_settings()
+
+_UNAUTHORIZED_HEADERS = [
+    (b"content-length", b"0"),
+    (b"www-authenticate", b"Bearer"),
+]
+
+
+class ForwardAuthMiddleware:
+    """Answers `auth_request` style sub-requests for the reverse proxy.
+
+    Requests to `path` are handled here before routing and logging: the
+    bearer token is checked against the decoded token cache, the denylist and
+    the cached token versions. Only a token version cache miss queries the
+    DB, and login primes that cache. Responds 200 with `X-User-Id` and
+    `X-User-Roles` or 401, everything else is passed on.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path: str = settings.FORWARD_AUTH_PATH,
+        session_factory=async_session,
+    ):
+        self.app = app
+        self.path = path
+        self.session_factory = session_factory
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        principal = await self.verify(scope)
+        if principal is None:
+            await self._respond(send, 401, _UNAUTHORIZED_HEADERS)
+            return
+        await self._respond(
+            send,
+            200,
+            [
+                (b"content-length", b"0"),
+                (b"x-user-id", str(principal.user_id).encode()),
+                (b"x-user-roles", ",".join(principal.roles).encode()),
+            ],
+        )
+
+    async def verify(self, scope: Scope) -> Principal | None:
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+                break
+        if authorization is None or authorization[:7].lower() != b"bearer ":
+            return None
+        token = authorization[7:].decode("latin-1").strip()
+        if is_reference_token(token):
+            payload = reference_token_store.cached(token)
+            if payload is None:
+                async with self.session_factory() as session:
+                    payload = await reference_token_store.resolve(token, session)
+            if payload is None:
+                return None
+        else:
+            try:
+                payload = await JWT.decode_jwt_token(token, "access")
+            except HTTPException:
+                return None
+        if payload.get("jti") in access_token_denylist:
+            return None
+        principal = Principal.from_claims(payload)
+        if principal is None:
+            return None
+        version = token_version_service.cache.get(principal.user_id)
+        if version is None:
+            async with self.session_factory() as session:
+                version = await token_version_service.get_current_version(
+                    principal.user_id, session, expected=payload.get("ver", 0)
+                )
+        if version is None or payload.get("ver", 0) != version:
+            return None
+        return principal
+
+    @staticmethod
+    async def _respond(send: Send, status: int, headers: list[tuple[bytes, bytes]]):
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": b""})
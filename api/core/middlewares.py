@@ -1,8 +1,19 @@
 from fastapi import Request
 from fastapi import Response
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
 
+from api.core.config import get_settings
 from api.core.logging.logging_app import logger
+from db.instrumentation import install_round_trip_listeners
+from db.instrumentation import track_round_trips
+
+settings = get_settings()
 
 
 class LoggingMiddleware(BaseHTTPMiddleware):
@@ -19,3 +30,34 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             raise exc
 
         return response
+
+
+class DBRoundTripMiddleware:
+    """Reports the DB round trips of each request in `X-DB-Round-Trips`.
+
+    Plain ASGI, so with `DB_ROUND_TRIP_INSTRUMENTATION` off a request costs a
+    single settings lookup. The engine listeners are only installed once a
+    request is instrumented.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.DB_ROUND_TRIP_INSTRUMENTATION:
+            await self.app(scope, receive, send)
+            return
+        install_round_trip_listeners()
+        with track_round_trips() as round_trips:
+
+            async def send_with_round_trips(message: Message):
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)["X-DB-Round-Trips"] = str(
+                        round_trips.count
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_round_trips)
+        logger.debug(
+            f"{round_trips.count} DB round trips for {scope['method']} {scope['path']}"
+        )
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from db.models import User
+from utils.roles import PortalRole
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated identity built from verified access token claims."""
+
+    user_id: UUID
+    email: str | None
+    roles: tuple[str, ...]
+
+    @property
+    def is_superadmin(self) -> bool:
+        return PortalRole.ROLE_PORTAL_SUPERADMIN in self.roles
+
+    @property
+    def is_admin(self) -> bool:
+        return PortalRole.ROLE_PORTAL_ADMIN in self.roles
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal | None":
+        user_id = payload.get("user_id")
+        roles = payload.get("roles")
+        if user_id is None or roles is None:
+            return None
+        try:
+            return cls(
+                user_id=UUID(user_id), email=payload.get("sub"), roles=tuple(roles)
+            )
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user_id=user.user_id, email=user.email, roles=tuple(user.roles))
@@ -0,0 +1,190 @@
+import math
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+
+from fastapi import Request
+
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+
+settings = get_settings()
+
+
+class RateLimitBackend(ABC):
+    """Sliding window counter: the previous fixed window is weighted by how
+    much of it still overlaps the sliding window, so every key costs two
+    counters no matter how many hits it receives."""
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: int) -> float | None:
+        """Count a hit, return seconds to wait if `key` is over `limit`."""
+
+    @abstractmethod
+    def reset(self):
+        pass
+
+    @staticmethod
+    def _estimate(previous: int, current: int, elapsed: float, window: int) -> float:
+        return previous * (window - elapsed) / window + current
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> [window_index, previous_count, current_count, expires_at]
+        self._counters: OrderedDict[str, list] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: int) -> float | None:
+        now = time.monotonic()
+        counter = self._counters.pop(key, None)
+        self._evict(now)
+        index, elapsed = divmod(now, window)
+        if counter is None or counter[0] < index - 1:
+            counter = [index, 0, 0, 0]
+        elif counter[0] == index - 1:
+            counter = [index, counter[2], 0, 0]
+        counter[3] = now + 2 * window
+        self._counters[key] = counter
+
+        if self._estimate(counter[1], counter[2] + 1, elapsed, window) > limit:
+            return window - elapsed
+        counter[2] += 1
+        return None
+
+    def reset(self):
+        self._counters.clear()
+
+    def _evict(self, now: float):
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            if counter[3] > now and len(self._counters) < self.max_keys:
+                break
+            del self._counters[key]
+
+
+class RateLimitStore(ABC):
+    """Minimal counter store API (INCR with expiry, GET) of a shared cache such
+    as Redis, so limits can be enforced across workers."""
+
+    @abstractmethod
+    async def incr(self, key: str, ttl: int) -> int:
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class LocalRateLimitStore(RateLimitStore):
+    """In-process stand-in for a shared store, handy for local runs and tests.
+
+    Holds at most `max_keys` keys, the least recently used ones are evicted
+    first, like in `InMemoryRateLimitBackend`.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (value, expires_at)
+        self._values: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    async def incr(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        value, expires_at = self._values.pop(key, (0, 0))
+        self._evict(now)
+        if expires_at <= now:
+            value, expires_at = 0, now + ttl
+        self._values[key] = (value + 1, expires_at)
+        return value + 1
+
+    async def get(self, key: str) -> int:
+        value, expires_at = self._values.get(key, (0, 0))
+        return value if expires_at > time.monotonic() else 0
+
+    def clear(self):
+        self._values.clear()
+
+    def _evict(self, now: float):
+        while self._values:
+            key, (_, expires_at) = next(iter(self._values.items()))
+            if expires_at > now and len(self._values) < self.max_keys:
+                break
+            del self._values[key]
+
+
+class SharedRateLimitBackend(RateLimitBackend):
+    def __init__(self, store: RateLimitStore):
+        self.store = store
+
+    async def hit(self, key: str, limit: int, window: int) -> float | None:
+        index, elapsed = divmod(time.time(), window)
+        previous = await self.store.get(f"{key}:{int(index) - 1}")
+        current = await self.store.incr(f"{key}:{int(index)}", 2 * window)
+        if self._estimate(previous, current, elapsed, window) > limit:
+            return window - elapsed
+        return None
+
+    def reset(self):
+        self.store.clear()
+
+
+def build_rate_limit_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "shared":
+        return SharedRateLimitBackend(LocalRateLimitStore(settings.RATE_LIMIT_MAX_KEYS))
+    return InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limit_backend = build_rate_limit_backend()
+
+
+def get_client_ip(request: Request) -> str:
+    if settings.TRUST_FORWARDED_FOR:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _submitted_email(request: Request, email_field: str) -> str | None:
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+    else:
+        body = await request.form()
+    email = body.get(email_field) if hasattr(body, "get") else None
+    return email.strip().lower() if isinstance(email, str) and email else None
+
+
+def rate_limit(
+    scope: str, per_ip: int, per_email: int = 0, email_field: str | None = None
+):
+    """Dependency factory limiting `scope` per client IP and, with
+    `email_field`, per submitted email.
+
+    Declare it before anything that opens a session or hashes a password so
+    rejected requests stay cheap.
+    """
+
+    async def check_rate_limit(request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        window = settings.RATE_LIMIT_WINDOW_SECONDS
+        keys = [(f"{scope}:ip:{get_client_ip(request)}", per_ip)]
+        if email_field and (email := await _submitted_email(request, email_field)):
+            keys.append((f"{scope}:email:{email}", per_email))
+        for key, limit in keys:
+            retry_after = await rate_limit_backend.hit(key, limit, window)
+            if retry_after is not None:
+                AppExceptions.too_many_requests_exception(
+                    "Too many requests, try again later.",
+                    retry_after=math.ceil(retry_after),
+                )
+
+    return check_rate_limit
@@ -2,22 +2,65 @@ from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import Request
 from fastapi import Response
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.admission import AdmissionPriority
+from api.core.admission import admit
 from api.core.config import get_settings
+from api.core.dependencies import authenticate_introspection_client
+from api.core.dependencies import decode_access_token
+from api.core.dependencies import get_current_user_from_access_token
 from api.core.dependencies import get_session
+from api.core.dependencies import oauth2_scheme
 from api.core.exceptions import AppExceptions
+from api.core.rate_limit import rate_limit
+from api.v1.auth.schemas import IntrospectionBatchRequest
 from api.v1.auth.schemas import Token
 from api.v1.auth.services.AuthService import AuthService
+from api.v1.auth.services.TokenIntrospector import token_introspector
+from db.models import User
+from utils.jwt import ASYMMETRIC_ACCESS_TOKENS
+from utils.keys import key_ring
 
 
 login_router = APIRouter()
+well_known_router = APIRouter()
 
 settings = get_settings()
 
+login_admission = admit(
+    "login", settings.LOGIN_CONCURRENCY_LIMIT, AdmissionPriority.LOW
+)
+token_admission = admit("token", settings.ADMISSION_CAPACITY, AdmissionPriority.HIGH)
+login_rate_limit = rate_limit(
+    "login",
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    per_email=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    email_field="username",
+)
+introspection_rate_limit = rate_limit(
+    "introspect", per_ip=settings.INTROSPECTION_RATE_LIMIT_PER_IP
+)
 
-@login_router.post("/", response_model=Token)
+
+def set_refresh_token_cookie(response: Response, refresh_token: str):
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=False,  # Not only https. Turn off in realise
+        samesite="Strict",
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+    )
+
+
+@login_router.post(
+    "/",
+    response_model=Token,
+    dependencies=[Depends(login_rate_limit), Depends(login_admission)],
+)
 async def login_for_get_tokens(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
@@ -30,27 +73,103 @@ async def login_for_get_tokens(
     access_token = await auth_service.create_access_token()
     refresh_token = await auth_service.create_refresh_token()
 
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=False,  # Not only https. Turn off in realise
-        samesite="Strict",
-        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
-    )
+    set_refresh_token_cookie(response, refresh_token)
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@login_router.post("/token", response_model=Token)
+@login_router.post(
+    "/token", response_model=Token, dependencies=[Depends(token_admission)]
+)
 async def create_new_access_token(
-    request: Request, session: AsyncSession = Depends(get_session)
+    request: Request, response: Response, session: AsyncSession = Depends(get_session)
 ):
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
         AppExceptions.unauthorized_exception("Could not validate credentials")
 
-    access_token = await AuthService.create_access_token_from_refresh(
+    access_token, refresh_token = await AuthService.create_access_token_from_refresh(
         refresh_token, session
     )
+    set_refresh_token_cookie(response, refresh_token)
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@login_router.post("/logout", status_code=204)
+async def logout(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_session),
+):
+    payload = await decode_access_token(token, session)
+    await AuthService.logout(
+        token, payload, request.cookies.get("refresh_token"), session
+    )
+    response = Response(status_code=204)
+    response.delete_cookie("refresh_token", httponly=True, samesite="Strict")
+    return response
+
+
+@login_router.post("/logout/all", status_code=204)
+async def logout_everywhere(
+    current_user: User = Depends(get_current_user_from_access_token),
+    session: AsyncSession = Depends(get_session),
+):
+    await AuthService.logout_everywhere(current_user, session)
+    response = Response(status_code=204)
+    response.delete_cookie("refresh_token", httponly=True, samesite="Strict")
+    return response
+
+
+@login_router.post(
+    "/introspect",
+    dependencies=[
+        Depends(introspection_rate_limit),
+        Depends(authenticate_introspection_client),
+        Depends(token_admission),
+    ],
+)
+async def introspect_tokens(
+    request: Request, session: AsyncSession = Depends(get_session)
+):
+    """RFC 7662 form request for one token, or a JSON body with `tokens` for many."""
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = IntrospectionBatchRequest.model_validate(await request.json())
+        except ValueError:
+            AppExceptions.validation_exception(
+                "Body should contain a non-empty list of tokens"
+            )
+        if len(body.tokens) > settings.INTROSPECTION_MAX_BATCH:
+            AppExceptions.validation_exception(
+                f"At most {settings.INTROSPECTION_MAX_BATCH} tokens per request"
+            )
+        results = [
+            await token_introspector.introspect(token, session, body.token_type_hint)
+            for token in body.tokens
+        ]
+        content = {"results": results}
+    else:
+        form = await request.form()
+        token = form.get("token")
+        if not token:
+            AppExceptions.validation_exception("Token is required")
+        results = [
+            await token_introspector.introspect(
+                token, session, form.get("token_type_hint")
+            )
+        ]
+        content = results[0]
+    max_age = min(token_introspector.max_age(result) for result in results)
+    return JSONResponse(
+        content=content, headers={"Cache-Control": f"private, max-age={max_age}"}
+    )
+
+
+@well_known_router.get("/jwks.json")
+async def get_jwks():
+    jwks = key_ring.jwks() if ASYMMETRIC_ACCESS_TOKENS else {"keys": []}
+    return JSONResponse(
+        content=jwks,
+        headers={"Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"},
+    )
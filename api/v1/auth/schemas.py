@@ -1,7 +1,9 @@
 import re
+from typing import Literal
 
 from pydantic import BaseModel
 from pydantic import EmailStr
+from pydantic import Field
 from pydantic import field_validator
 
 from api.core.exceptions import AppExceptions
@@ -29,3 +31,8 @@ class LoginUser(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class IntrospectionBatchRequest(BaseModel):
+    tokens: list[str] = Field(min_length=1)
+    token_type_hint: Literal["access_token", "refresh_token"] | None = None
@@ -1,10 +1,30 @@
+import time
+import uuid
+from uuid import UUID
+
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from api.v1.auth.services.LoginLockoutTracker import login_lockout_tracker
+from api.v1.auth.services.PasswordRehashWriter import password_rehash_writer
+from api.v1.auth.services.ReferenceTokenStore import is_reference_token
+from api.v1.auth.services.ReferenceTokenStore import reference_token_store
+from api.v1.auth.services.RefreshTokenStore import refresh_token_store
+from api.v1.auth.services.TokenIntrospector import token_introspector
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.auth.services.UserCache import user_cache
 from api.v1.users.actions import get_user_by_email_action
+from db.dals import RevokedAccessTokenDAL
 from db.models import User
+from utils.claims import compact_access_claims
+from utils.denylist import access_token_denylist
 from utils.hashing import Hasher
 from utils.jwt import JWT
+from utils.timestamps import to_datetime
+
+settings = get_settings()
 
 
 class AuthService:
@@ -15,9 +35,13 @@ class AuthService:
 
     @classmethod
     async def create(cls, email: str, password: str, session: AsyncSession):
+        login_lockout_tracker.ensure_not_locked(email)
         user = await cls._authenticate_user(email, password, session)
         if not user:
+            await login_lockout_tracker.register_failure(email, session)
             AppExceptions.unauthorized_exception("Incorrect username or password")
+        await login_lockout_tracker.reset(email, session)
+        token_version_service.remember(user.user_id, user.token_version)
         return cls(user, session)
 
     @staticmethod
@@ -26,36 +50,111 @@ class AuthService:
     ) -> User | None:
         user = await get_user_by_email_action(email, session)
         if user is not None:
-            if not Hasher.verify_password(password, user.hashed_password):
+            verified, new_hash = await Hasher.verify_and_update_async(
+                password, user.hashed_password
+            )
+            if not verified:
                 return None
+            if new_hash is not None:
+                password_rehash_writer.submit(
+                    user.user_id, user.hashed_password, new_hash
+                )
         return user
 
     async def create_access_token(self):
+        if settings.ACCESS_TOKEN_MODE == "reference":
+            return await reference_token_store.issue(self.user, self.session)
+        if settings.ACCESS_TOKEN_CLAIMS == "compact":
+            return await JWT.create_jwt_token(
+                data={
+                    **compact_access_claims(
+                        self.user.user_id, self.user.roles, self.user.token_version
+                    ),
+                    "jti": uuid.uuid4().hex,
+                },
+                token_type="access",
+            )
         return await JWT.create_jwt_token(
             data={
                 "sub": self.user.email,
                 "user_id": str(self.user.user_id),
                 "roles": self.user.roles,
+                "ver": self.user.token_version,
+                "jti": uuid.uuid4().hex,
             },
             token_type="access",
         )
 
     async def create_refresh_token(self):
-        return await JWT.create_jwt_token(
-            data={"sub": self.user.email},
-            token_type="refresh",
-        )
+        return await refresh_token_store.issue(self.user, self.session)
 
     @staticmethod
     async def create_access_token_from_refresh(
         refresh_token: str, session: AsyncSession
-    ):
+    ) -> tuple[str, str]:
+        """Exchange a refresh token for a new access token and the next
+        refresh token of its family."""
         payload = await JWT.decode_jwt_token(refresh_token, "refresh")
+        if "jti" in payload:
+            family_id = await refresh_token_store.consume(payload, session)
+        elif settings.REFRESH_TOKEN_ALLOW_LEGACY:
+            family_id = None
+        else:
+            AppExceptions.unauthorized_exception("Could not validate credentials")
         email: str = payload.get("sub")
         user: User = await get_user_by_email_action(email, session)
         if user is None:
             AppExceptions.not_found_exception(f"User with email {email} not found")
-        return await JWT.create_jwt_token(
-            data={"sub": email, "user_id": str(user.user_id), "roles": user.roles},
-            token_type="access",
-        )
+        token_version_service.ensure_matches_user(payload, user)
+        auth_service = AuthService(user, session)
+        access_token = await auth_service.create_access_token()
+        new_refresh_token = await refresh_token_store.issue(user, session, family_id)
+        return access_token, new_refresh_token
+
+    @staticmethod
+    async def logout(
+        access_token: str,
+        access_payload: dict,
+        refresh_token: str | None,
+        session: AsyncSession,
+    ):
+        """Revoke the access token and the refresh token family of this session."""
+        if jti := access_payload.get("jti"):
+            access_token_denylist.add(jti, access_payload["exp"])
+            # Other workers deny it once the revocation is announced on commit,
+            # expired revocations are purged here as logouts are rare
+            async with session.begin():
+                dal = RevokedAccessTokenDAL(session)
+                await dal.delete_expired(to_datetime(time.time()))
+                await dal.create(jti, to_datetime(access_payload["exp"]))
+        if is_reference_token(access_token):
+            await reference_token_store.revoke(access_token, session)
+        else:
+            JWT.forget_token(access_token)
+        token_introspector.forget(access_token)
+        if not refresh_token:
+            return
+        try:
+            refresh_payload = await JWT.decode_jwt_token(refresh_token, "refresh")
+            family_id = UUID(refresh_payload["fam"])
+        except (HTTPException, KeyError, ValueError):
+            return
+        try:
+            user_id = UUID(access_payload["user_id"])
+        except (KeyError, TypeError, ValueError):
+            user_id = None
+        email = access_payload["sub"]
+        if email not in (None, refresh_payload["sub"]):
+            return
+        if email is None and user_id is None:
+            return
+        # With a user_id the family is only revoked if it was issued to them
+        await refresh_token_store.revoke_family(family_id, session, user_id)
+        token_introspector.forget(refresh_token)
+
+    @staticmethod
+    async def logout_everywhere(user: User, session: AsyncSession):
+        """Invalidate every access and refresh token issued to the user so far
+        by bumping their token version."""
+        await token_version_service.bump(user.user_id, session)
+        user_cache.forget(user.user_id, user.email)
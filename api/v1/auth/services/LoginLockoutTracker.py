@@ -0,0 +1,125 @@
+import math
+import time
+from collections import OrderedDict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+from api.core.logging.logging_app import logger
+from db.dals import LoginLockoutDAL
+from db.session import async_session
+from utils.timestamps import to_datetime
+
+settings = get_settings()
+
+
+class LoginLockoutTracker:
+    """Counts consecutive failed logins per email and locks the account for
+    exponentially growing windows once `threshold` failures are reached.
+
+    State lives in a bounded in-memory table, entries are forgotten after
+    `reset_after` seconds without failures. With `persist` enabled every change
+    is also written to `login_lockouts` and reloaded on startup.
+    """
+
+    def __init__(
+        self,
+        threshold: int = settings.LOGIN_LOCKOUT_THRESHOLD,
+        base_seconds: int = settings.LOGIN_LOCKOUT_BASE_SECONDS,
+        max_seconds: int = settings.LOGIN_LOCKOUT_MAX_SECONDS,
+        reset_after: int = settings.LOGIN_LOCKOUT_RESET_SECONDS,
+        max_entries: int = settings.LOGIN_LOCKOUT_MAX_ENTRIES,
+        persist: bool = settings.LOGIN_LOCKOUT_PERSIST,
+    ):
+        self.threshold = threshold
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.reset_after = reset_after
+        self.max_entries = max_entries
+        self.persist = persist
+        # email -> (failures, locked_until, updated_at)
+        self._entries: OrderedDict[str, tuple[int, float | None, float]] = OrderedDict()
+
+    def ensure_not_locked(self, email: str):
+        entry = self._get(email.lower())
+        if entry is None or entry[1] is None:
+            return
+        retry_after = entry[1] - time.time()
+        if retry_after > 0:
+            AppExceptions.too_many_requests_exception(
+                "Account is temporarily locked, try again later.",
+                retry_after=math.ceil(retry_after),
+            )
+
+    async def register_failure(self, email: str, session: AsyncSession):
+        email = email.lower()
+        now = time.time()
+        entry = self._get(email)
+        failures = (entry[0] if entry else 0) + 1
+        locked_until = None
+        if failures >= self.threshold:
+            lock_seconds = min(
+                self.base_seconds * 2 ** (failures - self.threshold), self.max_seconds
+            )
+            locked_until = now + lock_seconds
+        self._set(email, (failures, locked_until, now))
+        if self.persist:
+            async with session.begin():
+                await LoginLockoutDAL(session).upsert(
+                    email=email,
+                    failures=failures,
+                    locked_until=to_datetime(locked_until),
+                    updated_at=to_datetime(now),
+                )
+
+    async def reset(self, email: str, session: AsyncSession):
+        email = email.lower()
+        if self._entries.pop(email, None) is not None and self.persist:
+            async with session.begin():
+                await LoginLockoutDAL(session).delete(email)
+
+    async def load(self, session_factory=async_session):
+        if not self.persist:
+            return
+        updated_since = to_datetime(time.time() - self.reset_after)
+        try:
+            async with session_factory() as session:
+                async with session.begin():
+                    lockouts = await LoginLockoutDAL(session).get_updated_since(
+                        updated_since
+                    )
+        except Exception as exc:
+            logger.error(f"Failed to load login lockouts: {exc}")
+            return
+        for lockout in sorted(lockouts, key=lambda item: item.updated_at):
+            locked_until = lockout.locked_until
+            self._set(
+                lockout.email,
+                (
+                    lockout.failures,
+                    locked_until.timestamp() if locked_until else None,
+                    lockout.updated_at.timestamp(),
+                ),
+            )
+
+    def clear(self):
+        self._entries.clear()
+
+    def _get(self, email: str) -> tuple[int, float | None, float] | None:
+        entry = self._entries.get(email)
+        if entry is None:
+            return None
+        if entry[2] + self.reset_after <= time.time():
+            del self._entries[email]
+            return None
+        return entry
+
+    def _set(self, email: str, entry: tuple[int, float | None, float]):
+        self._entries.pop(email, None)
+        self._entries[email] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+login_lockout_tracker = LoginLockoutTracker()
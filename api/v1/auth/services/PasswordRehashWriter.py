@@ -0,0 +1,102 @@
+import asyncio
+from uuid import UUID
+
+from api.core.config import get_settings
+from api.core.logging.logging_app import logger
+from api.v1.auth.services.UserCache import user_cache
+from db.dals import UserDAL
+from db.session import async_session
+
+settings = get_settings()
+
+
+class PasswordRehashWriter:
+    """Collects hashes upgraded during login and writes them in batches.
+
+    Upgrades are best effort: when the queue is full or the writer is not
+    running the upgrade is dropped and retried on the user's next login.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session,
+        batch_size: int = settings.REHASH_BATCH_SIZE,
+        flush_interval: float = settings.REHASH_FLUSH_INTERVAL_SECONDS,
+        max_queue: int = settings.REHASH_QUEUE_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batch: list[dict] = []
+
+    def submit(self, user_id: UUID, old_hash: str, new_hash: str):
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(
+                {"user_id": user_id, "old_hash": old_hash, "new_hash": new_hash}
+            )
+        except asyncio.QueueFull:
+            logger.debug("Rehash queue is full, upgrade dropped.")
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self._write(self._batch + self._drain())
+        self._batch = []
+        self._queue = None
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            await self._write(batch)
+
+    def _drain(self) -> list[dict]:
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: list[dict]):
+        if not batch:
+            return
+        latest = {item["user_id"]: item for item in batch}
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    await UserDAL(session).update_hashed_passwords(
+                        list(latest.values())
+                    )
+            for user_id in latest:
+                user_cache.forget(user_id)
+        except Exception as exc:
+            logger.error(f"Failed to store {len(latest)} rehashed users: {exc}")
+
+
+password_rehash_writer = PasswordRehashWriter()
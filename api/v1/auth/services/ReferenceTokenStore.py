@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import secrets
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import get_settings
+from api.core.logging.logging_app import logger
+from db.dals import AccessTokenDAL
+from db.models import User
+from db.session import async_session
+from db.session import read_only
+from utils.cache import TTLCache
+from utils.timestamps import to_datetime
+
+settings = get_settings()
+
+
+def is_reference_token(token: str) -> bool:
+    """JWTs always have three dot separated segments, reference tokens none.
+    Outside of reference mode nothing is looked up as a reference token."""
+    return settings.ACCESS_TOKEN_MODE == "reference" and "." not in token
+
+
+def token_hash(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class ReferenceTokenStore:
+    """Issues random opaque access tokens and resolves them to the same claims
+    a JWT access token carries.
+
+    Tokens live in `access_tokens` keyed by their SHA-256. Resolved claims
+    are cached for at most `revalidate_after` seconds, so resolving is
+    usually a digest and a dict lookup. Revoking deletes the row and the
+    local cache entry, other processes stop accepting the token once their
+    entry is revalidated. A background task deletes expired rows.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session,
+        lifetime_minutes: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+        cache_size: int = settings.REFERENCE_TOKEN_CACHE_SIZE,
+        purge_interval: float = settings.REFERENCE_TOKEN_PURGE_INTERVAL_SECONDS,
+        revalidate_after: float = settings.REFERENCE_TOKEN_CACHE_TTL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.lifetime = lifetime_minutes * 60
+        self.purge_interval = purge_interval
+        self.cache = TTLCache(maxsize=cache_size, ttl=revalidate_after)
+        self._task: asyncio.Task | None = None
+
+    async def issue(self, user: User, session: AsyncSession) -> str:
+        token = secrets.token_urlsafe(settings.REFERENCE_TOKEN_BYTES)
+        digest = token_hash(token)
+        exp = int(time.time()) + self.lifetime
+        async with session.begin():
+            await AccessTokenDAL(session).create(
+                token_hash=digest,
+                user_id=user.user_id,
+                email=user.email,
+                roles=list(user.roles),
+                token_version=user.token_version,
+                expires_at=to_datetime(exp),
+            )
+        self.cache.set(
+            digest,
+            {
+                "sub": user.email,
+                "user_id": str(user.user_id),
+                "roles": list(user.roles),
+                "ver": user.token_version,
+                "jti": digest.hex(),
+                "exp": exp,
+            },
+            expires_at=min(exp, time.time() + self.cache.ttl),
+        )
+        return token
+
+    def cached(self, token: str) -> dict | None:
+        return self.cache.get(token_hash(token))
+
+    async def resolve(self, token: str, session: AsyncSession) -> dict | None:
+        digest = token_hash(token)
+        payload = self.cache.get(digest)
+        if payload is not None:
+            return payload
+        async with read_only(session):
+            access_token = await AccessTokenDAL(session).get_active(
+                digest, to_datetime(time.time())
+            )
+        if access_token is None:
+            return None
+        exp = int(access_token.expires_at.timestamp())
+        payload = {
+            "sub": access_token.email,
+            "user_id": str(access_token.user_id),
+            "roles": access_token.roles,
+            "ver": access_token.token_version,
+            "jti": digest.hex(),
+            "exp": exp,
+        }
+        self.cache.set(
+            digest, payload, expires_at=min(exp, time.time() + self.cache.ttl)
+        )
+        return payload
+
+    async def revoke(self, token: str, session: AsyncSession):
+        digest = token_hash(token)
+        async with session.begin():
+            await AccessTokenDAL(session).delete(digest)
+        self.cache.pop(digest)
+
+    async def purge_expired(self):
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    await AccessTokenDAL(session).delete_expired(
+                        to_datetime(time.time())
+                    )
+        except Exception as exc:
+            logger.error(f"Failed to purge expired access tokens: {exc}")
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await self.purge_expired()
+            await asyncio.sleep(self.purge_interval)
+
+
+reference_token_store = ReferenceTokenStore()
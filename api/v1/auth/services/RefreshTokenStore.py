@@ -0,0 +1,202 @@
+import asyncio
+import datetime
+import time
+import uuid
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+from api.core.logging.logging_app import logger
+from db.dals import RefreshTokenDAL
+from db.models import RefreshToken
+from db.models import User
+from db.session import async_session
+from db.session import read_only
+from utils.cache import TTLCache
+from utils.jwt import JWT
+from utils.timestamps import to_datetime
+
+settings = get_settings()
+
+PARTITION_PREFIX = f"{RefreshToken.__tablename__}_p"
+
+
+class RefreshTokenStore:
+    """Keeps every issued refresh token in `refresh_tokens`, grouped into
+    families that start at login. A token can be exchanged exactly once, the
+    exchange issues the next token of the same family. Presenting an already
+    used token revokes the whole family.
+
+    Used tokens and revoked families are remembered in bounded LRU caches so
+    replays are rejected without a round trip. A background task keeps daily
+    partitions created ahead of time and drops the ones that have expired.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session,
+        lifetime_days: int = settings.REFRESH_TOKEN_EXPIRE_DAYS,
+        cache_size: int = settings.REFRESH_TOKEN_CACHE_SIZE,
+        maintenance_interval: float = settings.REFRESH_TOKEN_MAINTENANCE_INTERVAL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.lifetime = lifetime_days * 24 * 60 * 60
+        self.lifetime_days = lifetime_days
+        self.maintenance_interval = maintenance_interval
+        self._used_tokens = TTLCache(maxsize=cache_size, ttl=self.lifetime)
+        self._revoked_families = TTLCache(maxsize=cache_size, ttl=self.lifetime)
+        self._task: asyncio.Task | None = None
+
+    async def issue(
+        self, user: User, session: AsyncSession, family_id: UUID | None = None
+    ) -> str:
+        jti = uuid.uuid4()
+        family_id = family_id or uuid.uuid4()
+        exp = int(time.time()) + self.lifetime
+        async with session.begin():
+            await RefreshTokenDAL(session).create(
+                jti=jti,
+                family_id=family_id,
+                user_id=user.user_id,
+                expires_at=to_datetime(exp),
+            )
+        return await JWT.create_jwt_token(
+            data={
+                "sub": user.email,
+                "ver": user.token_version,
+                "jti": str(jti),
+                "fam": str(family_id),
+                "exp": exp,
+            },
+            token_type="refresh",
+        )
+
+    async def consume(self, payload: dict, session: AsyncSession) -> UUID:
+        """Spend the refresh token described by `payload` and return its family."""
+        try:
+            jti = UUID(payload["jti"])
+            family_id = UUID(payload["fam"])
+        except (KeyError, TypeError, ValueError):
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+        if family_id in self._revoked_families:
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+
+        consumed_family_id = None
+        async with session.begin():
+            dal = RefreshTokenDAL(session)
+            if jti not in self._used_tokens:
+                consumed_family_id = await dal.consume(
+                    jti=jti,
+                    expires_at=to_datetime(payload["exp"]),
+                    used_at=to_datetime(time.time()),
+                )
+            if consumed_family_id is None:
+                await dal.revoke_family(family_id)
+
+        if consumed_family_id is None:
+            logger.warning(f"Refresh token reuse detected, family {family_id} revoked")
+            self._revoked_families.set(family_id, True)
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+        self._used_tokens.set(jti, True, expires_at=payload["exp"])
+        return consumed_family_id
+
+    async def is_active(self, payload: dict, session: AsyncSession) -> bool:
+        try:
+            jti = UUID(payload["jti"])
+            family_id = UUID(payload["fam"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if family_id in self._revoked_families or jti in self._used_tokens:
+            return False
+        async with read_only(session):
+            return await RefreshTokenDAL(session).is_active(
+                jti=jti, expires_at=to_datetime(payload["exp"])
+            )
+
+    async def revoke_family(
+        self, family_id: UUID, session: AsyncSession, user_id: UUID | None = None
+    ):
+        """Revoke the family, with `user_id` only if it belongs to that user."""
+        async with session.begin():
+            revoked = await RefreshTokenDAL(session).revoke_family(family_id, user_id)
+        if revoked or user_id is None:
+            self._revoked_families.set(family_id, True)
+
+    async def maintain(self):
+        """Create partitions for every day a new token can expire on and drop
+        the partitions whose tokens have all expired.
+
+        Every step runs in its own transaction, so one failing step does not
+        hold back the others.
+        """
+        today = datetime.datetime.now(datetime.timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        try:
+            async with self.session_factory() as session:
+                async with read_only(session):
+                    partitions = set(await RefreshTokenDAL(session).get_partitions())
+        except Exception as exc:
+            logger.error(f"Refresh token partition maintenance failed: {exc}")
+            return
+        for days in range(self.lifetime_days + 2):
+            start = today + datetime.timedelta(days=days)
+            name = f"{PARTITION_PREFIX}{start:%Y%m%d}"
+            if name not in partitions:
+                await self._maintenance_step(
+                    f"create partition {name}",
+                    lambda dal: dal.create_partition(
+                        name, start, start + datetime.timedelta(days=1)
+                    ),
+                )
+        for name in partitions:
+            if not name.startswith(PARTITION_PREFIX):
+                continue
+            day = datetime.datetime.strptime(
+                name.removeprefix(PARTITION_PREFIX), "%Y%m%d"
+            ).replace(tzinfo=datetime.timezone.utc)
+            if day < today:
+                await self._maintenance_step(
+                    f"drop partition {name}", lambda dal: dal.drop_partition(name)
+                )
+        await self._maintenance_step(
+            "delete expired tokens from the default partition",
+            lambda dal: dal.delete_expired_from_default(today),
+        )
+
+    async def _maintenance_step(self, description: str, step):
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    await step(RefreshTokenDAL(session))
+        except Exception as exc:
+            logger.error(f"Refresh token maintenance failed to {description}: {exc}")
+
+    async def start(self):
+        # Partitions for the coming days exist before the first token is issued
+        await self.maintain()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            await self.maintain()
+
+    def clear(self):
+        self._used_tokens.clear()
+        self._revoked_families.clear()
+
+
+refresh_token_store = RefreshTokenStore()
@@ -0,0 +1,108 @@
+import time
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import get_settings
+from api.core.dependencies import decode_access_token
+from api.v1.auth.services.RefreshTokenStore import refresh_token_store
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.users.actions import get_user_by_email_action
+from utils.cache import TTLCache
+from utils.jwt import JWT
+from utils.jwt import token_digest
+
+settings = get_settings()
+
+INACTIVE = {"active": False}
+TOKEN_TYPES = ("access_token", "refresh_token")
+
+
+class TokenIntrospector:
+    """RFC 7662 introspection of tokens issued by `JWT`.
+
+    Results are cached by token digest for `ttl` seconds and never past the
+    token's `exp`, so revocations show up after at most `ttl` seconds unless
+    the token is dropped with `forget`.
+    """
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    async def introspect(
+        self, token: str, session: AsyncSession, token_type_hint: str | None = None
+    ) -> dict:
+        digest = token_digest(token)
+        result = self.cache.get(digest)
+        if result is not None:
+            return result
+        token_types = sorted(TOKEN_TYPES, key=lambda item: item != token_type_hint)
+        for token_type in token_types:
+            result = await self._introspect(token, token_type, session)
+            if result["active"]:
+                break
+        expires_at = time.time() + self.cache.ttl
+        if result["active"]:
+            expires_at = min(expires_at, result["exp"])
+        self.cache.set(digest, result, expires_at=expires_at)
+        return result
+
+    def max_age(self, result: dict) -> int:
+        """Seconds a client may reuse `result` for."""
+        if not result["active"]:
+            return int(self.cache.ttl)
+        return max(int(min(self.cache.ttl, result["exp"] - time.time())), 0)
+
+    def forget(self, token: str):
+        self.cache.pop(token_digest(token))
+
+    async def _introspect(
+        self, token: str, token_type: str, session: AsyncSession
+    ) -> dict:
+        try:
+            if token_type == "access_token":
+                payload = await decode_access_token(token, session)
+            else:
+                payload = await JWT.decode_jwt_token(token, "refresh")
+        except HTTPException:
+            return INACTIVE
+        if token_type == "access_token":
+            try:
+                user_id = UUID(payload["user_id"])
+            except (KeyError, TypeError, ValueError):
+                return INACTIVE
+            version = await token_version_service.get_current_version(
+                user_id, session, expected=payload.get("ver", 0)
+            )
+            roles = payload.get("roles")
+        else:
+            if "jti" in payload and not await refresh_token_store.is_active(
+                payload, session
+            ):
+                return INACTIVE
+            user = await get_user_by_email_action(payload["sub"], session)
+            if user is None:
+                return INACTIVE
+            user_id, version, roles = user.user_id, user.token_version, user.roles
+        if version is None or payload.get("ver", 0) != version:
+            return INACTIVE
+        result = {
+            "active": True,
+            "token_type": token_type,
+            "sub": payload["sub"] or str(user_id),
+            "user_id": str(user_id),
+            "roles": roles,
+            "exp": payload["exp"],
+        }
+        if "jti" in payload:
+            result["jti"] = payload["jti"]
+        return result
+
+
+token_introspector = TokenIntrospector(
+    TTLCache(
+        maxsize=settings.INTROSPECTION_CACHE_SIZE,
+        ttl=settings.INTROSPECTION_CACHE_TTL_SECONDS,
+    )
+)
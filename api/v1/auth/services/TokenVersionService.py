@@ -0,0 +1,79 @@
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+from db.dals import UserDAL
+from db.models import User
+from db.session import read_only
+from db.session import replica_reads_enabled
+from utils.cache import TTLCache
+
+settings = get_settings()
+
+
+class TokenVersionService:
+    """Tokens carry the user's `token_version` in the `ver` claim, bumping the
+    column invalidates every token issued before. Current versions are kept in
+    a small TTL cache so claims-only verification rarely touches the DB."""
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    async def get_current_version(
+        self, user_id: UUID, session: AsyncSession, expected: int | None = None
+    ) -> int | None:
+        """With the version a token claims as `expected`, a cache miss is
+        looked up on the read replica and only confirmed on the primary when
+        the replica disagrees.
+
+        Only versions read from the primary are cached. A replica that has
+        not replayed a bump yet would otherwise keep a revoked version
+        cached for the whole TTL.
+        """
+        version = self.cache.get(user_id)
+        if version is not None:
+            return version
+        if expected is not None and replica_reads_enabled():
+            async with read_only(session, replica=True):
+                version = await UserDAL(session).get_token_version(user_id)
+            if version == expected:
+                return version
+            # The replica may not have replayed a signup or a bump yet
+        async with read_only(session):
+            version = await UserDAL(session).get_token_version(user_id)
+        if version is not None:
+            self.cache.set(user_id, version)
+        return version
+
+    async def ensure_current(self, payload: dict, user_id: UUID, session: AsyncSession):
+        expected = payload.get("ver", 0)
+        current_version = await self.get_current_version(user_id, session, expected)
+        if current_version is None or expected != current_version:
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+
+    @staticmethod
+    def ensure_matches_user(payload: dict, user: User):
+        if payload.get("ver", 0) != user.token_version:
+            AppExceptions.unauthorized_exception("Could not validate credentials")
+
+    async def bump(self, user_id: UUID, session: AsyncSession) -> int | None:
+        async with session.begin():
+            version = await UserDAL(session).bump_token_version(user_id)
+        self.forget(user_id)
+        return version
+
+    def remember(self, user_id: UUID, version: int):
+        self.cache.set(user_id, version)
+
+    def forget(self, user_id: UUID):
+        self.cache.pop(user_id)
+
+
+token_version_service = TokenVersionService(
+    TTLCache(
+        maxsize=settings.TOKEN_VERSION_CACHE_SIZE,
+        ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+    )
+)
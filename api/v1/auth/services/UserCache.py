@@ -0,0 +1,172 @@
+import asyncio
+import time
+from uuid import UUID
+
+from prometheus_client import Counter
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from api.core.config import get_settings
+from api.core.logging.logging_app import logger
+from db.dals import UserDAL
+from db.models import User
+from db.session import async_session
+from db.session import read_only
+from utils.cache import TTLCache
+
+settings = get_settings()
+
+USER_CACHE_LOOKUPS = Counter(
+    "user_cache_lookups",
+    "User lookups by result: fresh hit, stale hit served while revalidating, "
+    "or miss.",
+    ["result"],
+)
+
+_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+def _snapshot(user: User) -> dict:
+    return {key: getattr(user, key) for key in _COLUMNS}
+
+
+def _to_user(columns: dict) -> User:
+    # Every hit gets its own detached instance, no request can change the
+    # cached record or drag it into its session
+    user = User(
+        **{
+            key: list(value) if isinstance(value, list) else value
+            for key, value in columns.items()
+        }
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+class UserCache:
+    """Column snapshots of users in front of `UserDAL` lookups by id and email.
+
+    Entries are fresh for `ttl` seconds. For another `stale_ttl` seconds a
+    hit still returns the old snapshot and reloads the user in the
+    background. Call `forget` once a change to the user has committed.
+
+    `forget` also advances an epoch, so a load that started before the
+    change cannot put the old row back. Rows read from the replica are
+    never stored: one that has not replayed the change yet could otherwise
+    put the old row back after the eviction.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session,
+        maxsize: int = settings.USER_CACHE_SIZE,
+        ttl: float = settings.USER_CACHE_TTL_SECONDS,
+        stale_ttl: float = settings.USER_CACHE_STALE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        # user_id -> (columns, fresh until)
+        self._users = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self._ids_by_email = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self._epoch = 0
+        self._refreshing: dict[UUID, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get_by_id(
+        self, user_id: UUID, session: AsyncSession, replica: bool = False
+    ) -> User | None:
+        user = self._cached(user_id)
+        if user is not None:
+            return user
+        epoch = self._epoch
+        async with read_only(session, replica=replica):
+            user = await UserDAL(session).get_user_by_id(user_id)
+        if not replica:
+            self._store(user, epoch)
+        return user
+
+    async def get_by_email(
+        self, email: str, session: AsyncSession, replica: bool = False
+    ) -> User | None:
+        user = self._cached(self._ids_by_email.get(email), email)
+        if user is not None:
+            return user
+        epoch = self._epoch
+        async with read_only(session, replica=replica):
+            user = await UserDAL(session).get_user_by_email(email=email)
+        if not replica:
+            self._store(user, epoch)
+        return user
+
+    def forget(self, user_id: UUID, email: str | None = None):
+        self._epoch += 1
+        self._users.pop(user_id)
+        if email is not None:
+            self._ids_by_email.pop(email)
+
+    def forget_all(self):
+        self._epoch += 1
+        self._users.clear()
+        self._ids_by_email.clear()
+
+    def clear(self):
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        self._users.clear()
+        self._ids_by_email.clear()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / total if total else 0.0
+
+    def _cached(self, user_id: UUID | None, email: str | None = None) -> User | None:
+        entry = None if user_id is None else self._users.get(user_id)
+        if entry is None or (email is not None and entry[0]["email"] != email):
+            self.misses += 1
+            USER_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+        columns, fresh_until = entry
+        if fresh_until > time.time():
+            self.hits += 1
+            USER_CACHE_LOOKUPS.labels("hit").inc()
+        else:
+            self.stale_hits += 1
+            USER_CACHE_LOOKUPS.labels("stale").inc()
+            self._revalidate(user_id)
+        return _to_user(columns)
+
+    def _store(self, user: User | None, epoch: int):
+        if user is None or epoch != self._epoch:
+            return
+        self._users.set(user.user_id, (_snapshot(user), time.time() + self.ttl))
+        self._ids_by_email.set(user.email, user.user_id)
+
+    def _revalidate(self, user_id: UUID):
+        if user_id not in self._refreshing:
+            self._refreshing[user_id] = asyncio.create_task(self._refresh(user_id))
+
+    async def _refresh(self, user_id: UUID):
+        epoch = self._epoch
+        try:
+            async with self.session_factory() as session:
+                async with read_only(session):
+                    user = await UserDAL(session).get_user_by_id(user_id)
+            if user is None:
+                self.forget(user_id)
+            else:
+                self._store(user, epoch)
+        except Exception as exc:
+            logger.error(f"Failed to revalidate cached user {user_id}: {exc}")
+        finally:
+            self._refreshing.pop(user_id, None)
+
+
+user_cache = UserCache()
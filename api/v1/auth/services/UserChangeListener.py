@@ -0,0 +1,121 @@
+import asyncio
+import json
+import time
+from uuid import UUID
+
+import asyncpg
+
+from api.core.config import get_settings
+from api.core.logging.logging_app import logger
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.auth.services.UserCache import user_cache
+from db.dals import RevokedAccessTokenDAL
+from db.dals import TOKEN_REVOCATIONS_CHANNEL
+from db.dals import USER_CHANGES_CHANNEL
+from db.session import async_session
+from db.session import read_only
+from utils.denylist import access_token_denylist
+from utils.timestamps import to_datetime
+
+settings = get_settings()
+
+
+class UserChangeListener:
+    """Evicts users that other workers changed from this worker's caches and
+    denies access tokens they revoked.
+
+    `UserDAL` mutations notify `USER_CHANGES_CHANNEL` and logouts notify
+    `TOKEN_REVOCATIONS_CHANNEL` on commit. A dedicated connection LISTENs to
+    both channels and is pinged every `interval` seconds. Notifications sent
+    while it is disconnected are lost, so on every (re)connect the caches are
+    cleared and the revocations that have not expired are loaded into the
+    denylist. Failures are logged and retried after `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        dsn: str = settings.DATABASE_URL.replace("+asyncpg", ""),
+        interval: float = settings.USER_CHANGE_LISTENER_INTERVAL_SECONDS,
+        session_factory=async_session,
+    ):
+        self.dsn = dsn
+        self.interval = interval
+        self.session_factory = session_factory
+        self.listening = False
+        self._task: asyncio.Task | None = None
+
+    def evict(self, user_id: UUID, email: str | None = None):
+        user_cache.forget(user_id, email)
+        token_version_service.forget(user_id)
+
+    def evict_all(self):
+        user_cache.forget_all()
+        token_version_service.cache.clear()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self._listen()
+            except Exception as exc:
+                logger.error(f"User change listener disconnected: {exc}")
+            await asyncio.sleep(self.interval)
+
+    async def _listen(self):
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await connection.add_listener(USER_CHANGES_CHANNEL, self._on_notification)
+            await connection.add_listener(
+                TOKEN_REVOCATIONS_CHANNEL, self._on_revocation
+            )
+            self.evict_all()
+            await self.load_revocations()
+            self.listening = True
+            while True:
+                await asyncio.sleep(self.interval)
+                await connection.execute("SELECT 1", timeout=self.interval)
+        finally:
+            self.listening = False
+            connection.terminate()
+
+    async def load_revocations(self):
+        async with self.session_factory() as session:
+            async with read_only(session):
+                revocations = await RevokedAccessTokenDAL(session).get_active(
+                    to_datetime(time.time())
+                )
+        for jti, expires_at in revocations:
+            access_token_denylist.add(jti, expires_at.timestamp())
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        try:
+            change = json.loads(payload)
+            user_id = UUID(change["user_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.error(f"Malformed user change notification: {payload}")
+            return
+        self.evict(user_id, change.get("email"))
+
+    def _on_revocation(self, connection, pid: int, channel: str, payload: str):
+        try:
+            revocation = json.loads(payload)
+            jti, expires_at = str(revocation["jti"]), float(revocation["exp"])
+        except (ValueError, KeyError, TypeError):
+            logger.error(f"Malformed token revocation notification: {payload}")
+            return
+        access_token_denylist.add(jti, expires_at)
+
+
+user_change_listener = UserChangeListener()
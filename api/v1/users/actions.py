@@ -3,51 +3,64 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.core.exceptions import AppExceptions
+from api.core.principal import Principal
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.auth.services.UserCache import user_cache
 from api.v1.users.schemas import UpdateUserRequest
 from api.v1.users.schemas import UserCreate
 from db.dals import UserDAL
 from db.models import User
+from db.session import after_commit
+from db.session import autocommit
+from db.session import transaction
 from utils.hashing import Hasher
 from utils.roles import PortalRole
 
 
 async def create_new_user_action(body: UserCreate, session: AsyncSession) -> User:
-    if await get_user_by_email_action(body.email, session) is not None:
-        AppExceptions.conflict_exception(
-            f"User with this email {body.email} already exists."
-        )
-    async with session.begin():
-        return await UserDAL(session).create_user(
+    hashed_password = await Hasher.get_password_hash_async(body.password)
+    async with transaction(session):
+        user = await UserDAL(session).create_user(
             name=body.name,
             surname=body.surname,
             email=body.email,
-            hashed_password=Hasher.get_password_hash(body.password),
+            hashed_password=hashed_password,
             roles=[PortalRole.ROLE_PORTAL_USER],
         )
+    if user is None:
+        AppExceptions.conflict_exception(
+            f"User with this email {body.email} already exists."
+        )
+    return user
 
 
 async def delete_user_action(user_id: UUID, session: AsyncSession) -> UUID | None:
-    async with session.begin():
+    async with transaction(session):
+        after_commit(session, lambda: user_cache.forget(user_id))
         return await UserDAL(session).delete_user(
             user_id=user_id,
         )
 
 
 async def activate_user_action(user_id: UUID, session: AsyncSession) -> UUID | None:
-    async with session.begin():
+    async with transaction(session):
+        after_commit(session, lambda: user_cache.forget(user_id))
         return await UserDAL(session).activate_user(
             user_id=user_id,
         )
 
 
 async def process_user_update_request_action(
-    user_id: UUID, updated_user_params: UpdateUserRequest, session: AsyncSession
-) -> UUID | None:
+    user: User, updated_user_params: UpdateUserRequest, session: AsyncSession
+) -> UUID:
+    """Check the old password and hash the new one without holding a
+    connection, then update with a single conditional UPDATE. 409 if the
+    password or token version (roles included) changed since `user` was
+    read."""
     updated_params = updated_user_params.model_dump(exclude_none=True)
-    user = await get_user_by_id_action(user_id, session)
 
     old_password = updated_params.pop("old_password", None)
-    if not old_password or not Hasher.verify_password(
+    if not old_password or not await Hasher.verify_password_async(
         old_password, user.hashed_password
     ):
         AppExceptions.unauthorized_exception("Incorrect password")
@@ -58,34 +71,75 @@ async def process_user_update_request_action(
         )
 
     if new_password := updated_params.pop("new_password", None):
-        updated_params["hashed_password"] = Hasher.get_password_hash(new_password)
-
-    return await update_user_action(user_id, updated_params, session)
+        updated_params["hashed_password"] = await Hasher.get_password_hash_async(
+            new_password
+        )
+        updated_params["token_version"] = User.token_version + 1
+
+    if "token_version" in updated_params:
+        after_commit(session, lambda: token_version_service.forget(user.user_id))
+    updated_user_id = await update_user_action(
+        user.user_id,
+        updated_params,
+        session,
+        if_matches={
+            "hashed_password": user.hashed_password,
+            "token_version": user.token_version,
+        },
+    )
+    if updated_user_id is None:
+        # A cached copy may be what is outdated, the retry reads it afresh
+        user_cache.forget(user.user_id)
+        AppExceptions.conflict_exception(
+            "User is inactive or was changed meanwhile, try again."
+        )
+    return updated_user_id
 
 
 async def update_user_action(
-    user_id: UUID, updated_user_params: dict, session: AsyncSession
+    user_id: UUID,
+    updated_user_params: dict,
+    session: AsyncSession,
+    if_matches: dict | None = None,
 ) -> UUID | None:
-    async with session.begin():
+    async with autocommit(session):
+        after_commit(session, lambda: user_cache.forget(user_id))
         return await UserDAL(session).update_user(
-            user_id=user_id, **updated_user_params
+            user_id=user_id, if_matches=if_matches, **updated_user_params
         )
 
 
-async def get_user_by_id_action(user_id: UUID, session: AsyncSession) -> User | None:
-    async with session.begin():
-        return await UserDAL(session).get_user_by_id(user_id)
+async def get_user_by_id_action(
+    user_id: UUID,
+    session: AsyncSession,
+    for_update: bool = False,
+    replica: bool = False,
+) -> User | None:
+    if for_update:
+        return await UserDAL(session).get_user_by_id(user_id, for_update=True)
+    return await user_cache.get_by_id(user_id, session, replica=replica)
+
+
+async def get_user_by_email_action(
+    email: str, session: AsyncSession, replica: bool = False
+) -> User | None:
+    return await user_cache.get_by_email(email, session, replica=replica)
 
 
-async def get_user_by_email_action(email: str, session: AsyncSession) -> User | None:
-    async with session.begin():
-        return await UserDAL(session).get_user_by_email(email=email)
+def forget_user(user_id: UUID):
+    token_version_service.forget(user_id)
+    user_cache.forget(user_id)
 
 
 async def fetch_user_or_raise(
-    user_id: UUID, current_user: User, session: AsyncSession
+    user_id: UUID,
+    current_user: User | Principal,
+    session: AsyncSession,
+    for_update: bool = False,
 ) -> User:
-    target_user = await get_user_by_id_action(user_id, session)
+    """Load the target user, with `for_update` it stays locked until the
+    caller's transaction ends."""
+    target_user = await get_user_by_id_action(user_id, session, for_update)
     if target_user is None:
         if current_user.is_admin or current_user.is_superadmin:
             AppExceptions.not_found_exception(f"User with id {user_id} not found.")
@@ -93,8 +147,10 @@ async def fetch_user_or_raise(
     return target_user
 
 
-async def check_user_permissions(target_user: User, current_user: User) -> bool:
-    if target_user == current_user:
+async def check_user_permissions(
+    target_user: User, current_user: User | Principal
+) -> bool:
+    if target_user.user_id == current_user.user_id:
         return True
     if target_user.is_superadmin:
         return False
@@ -105,21 +161,32 @@ async def check_user_permissions(target_user: User, current_user: User) -> bool:
     return False
 
 
+def raise_if_inactive(user: User):
+    if not user.is_active:
+        AppExceptions.conflict_exception(f"User with email {user.email} is inactive")
+
+
 async def grant_admin_privilege_action(
     user_id: UUID, current_user: User, session: AsyncSession
 ) -> UUID | None:
     if current_user.user_id == user_id:
         AppExceptions.bad_request_exception("Cannot manage privileges of itself.")
-    user_for_promotion = await fetch_user_or_raise(user_id, current_user, session)
-    if user_for_promotion.is_admin or user_for_promotion.is_superadmin:
+    async with autocommit(session):
+        updated_user_id = await UserDAL(session).add_role(
+            user_id,
+            PortalRole.ROLE_PORTAL_ADMIN,
+            unless_any=(PortalRole.ROLE_PORTAL_SUPERADMIN,),
+        )
+        if updated_user_id is not None:
+            after_commit(session, lambda: forget_user(user_id))
+    if updated_user_id is None:
+        # Only failures pay for a second query to tell 404 from 409
+        user = await fetch_user_or_raise(user_id, current_user, session)
+        raise_if_inactive(user)
         AppExceptions.conflict_exception(
-            f"User with email {user_for_promotion.email} already promoted to admin / superadmin"
+            f"User with email {user.email} already promoted to admin / superadmin"
         )
-    return await update_user_action(
-        user_id=user_id,
-        updated_user_params={"roles": user_for_promotion.extend_roles_with_admin()},
-        session=session,
-    )
+    return updated_user_id
 
 
 async def revoke_admin_privilege_action(
@@ -127,13 +194,16 @@ async def revoke_admin_privilege_action(
 ) -> UUID | None:
     if current_user.user_id == user_id:
         AppExceptions.bad_request_exception("Cannot manage privileges of itself.")
-    user_for_promotion = await fetch_user_or_raise(user_id, current_user, session)
-    if not user_for_promotion.is_admin:
+    async with autocommit(session):
+        updated_user_id = await UserDAL(session).remove_role(
+            user_id, PortalRole.ROLE_PORTAL_ADMIN
+        )
+        if updated_user_id is not None:
+            after_commit(session, lambda: forget_user(user_id))
+    if updated_user_id is None:
+        user = await fetch_user_or_raise(user_id, current_user, session)
+        raise_if_inactive(user)
         AppExceptions.conflict_exception(
-            f"User with email {user_for_promotion.email} has no admin privileges"
+            f"User with email {user.email} has no admin privileges"
         )
-    return await update_user_action(
-        user_id=user_id,
-        updated_user_params={"roles": user_for_promotion.exclude_admin_role()},
-        session=session,
-    )
+    return updated_user_id
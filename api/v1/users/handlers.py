@@ -5,9 +5,15 @@ from fastapi import Depends
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.admission import AdmissionPriority
+from api.core.admission import admit
+from api.core.config import get_settings
+from api.core.dependencies import get_current_principal
 from api.core.dependencies import get_current_user_from_access_token as get_current_user
 from api.core.dependencies import get_session
 from api.core.exceptions import AppExceptions
+from api.core.principal import Principal
+from api.core.rate_limit import rate_limit
 from api.v1.users.actions import activate_user_action
 from api.v1.users.actions import check_user_permissions
 from api.v1.users.actions import create_new_user_action
@@ -23,12 +29,29 @@ from api.v1.users.schemas import UpdatedUserResponse
 from api.v1.users.schemas import UpdateUserRequest
 from api.v1.users.schemas import UserCreate
 from db.models import User
+from db.session import transaction
 from utils.decorators import only_superadmin
 
 user_router = APIRouter()
 
+settings = get_settings()
 
-@user_router.post("/", response_model=ShowUser)
+signup_admission = admit(
+    "signup", settings.SIGNUP_CONCURRENCY_LIMIT, AdmissionPriority.LOW
+)
+signup_rate_limit = rate_limit(
+    "signup",
+    per_ip=settings.SIGNUP_RATE_LIMIT_PER_IP,
+    per_email=settings.SIGNUP_RATE_LIMIT_PER_EMAIL,
+    email_field="email",
+)
+
+
+@user_router.post(
+    "/",
+    response_model=ShowUser,
+    dependencies=[Depends(signup_rate_limit), Depends(signup_admission)],
+)
 async def create_user(
     body: UserCreate, session: AsyncSession = Depends(get_session)
 ) -> ShowUser:
@@ -48,19 +71,24 @@ async def create_user(
 @user_router.delete("/", response_model=DeleteUserResponse)
 async def delete_user(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_session),
 ) -> DeleteUserResponse:
-    target_user = await fetch_user_or_raise(user_id, current_user, session)
-    if target_user == current_user and current_user.is_superadmin:
-        AppExceptions.not_acceptable_exception("Superadmin cannot be deleted via API.")
+    async with transaction(session):
+        target_user = await fetch_user_or_raise(
+            user_id, current_user, session, for_update=True
+        )
+        if target_user.user_id == current_user.user_id and current_user.is_superadmin:
+            AppExceptions.not_acceptable_exception(
+                "Superadmin cannot be deleted via API."
+            )
 
-    if not await check_user_permissions(
-        target_user=target_user, current_user=current_user
-    ):
-        AppExceptions.forbidden_exception()
+        if not await check_user_permissions(
+            target_user=target_user, current_user=current_user
+        ):
+            AppExceptions.forbidden_exception()
 
-    deleted_user_id = await delete_user_action(user_id, session)
+        deleted_user_id = await delete_user_action(user_id, session)
     if deleted_user_id is None:
         AppExceptions.not_found_exception(f"User with id {user_id} not found.")
     return DeleteUserResponse(deleted_user_id=deleted_user_id)
@@ -69,23 +97,26 @@ async def delete_user(
 @user_router.post("/activate", response_model=ActivateUserResponse)
 async def activate_user(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_session),
 ) -> ActivateUserResponse:
-    target_user = await fetch_user_or_raise(user_id, current_user, session)
-    if not await check_user_permissions(
-        target_user=target_user, current_user=current_user
-    ):
-        AppExceptions.forbidden_exception()
+    async with transaction(session):
+        target_user = await fetch_user_or_raise(
+            user_id, current_user, session, for_update=True
+        )
+        if not await check_user_permissions(
+            target_user=target_user, current_user=current_user
+        ):
+            AppExceptions.forbidden_exception()
 
-    activated_user_id = await activate_user_action(user_id, session)
+        activated_user_id = await activate_user_action(user_id, session)
     return ActivateUserResponse(activated_user_id=activated_user_id)
 
 
 @user_router.get("/", response_model=ShowUser)
 async def get_user_by_id(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_session),
 ) -> ShowUser:
     target_user = await fetch_user_or_raise(user_id, current_user, session)
@@ -107,7 +138,7 @@ async def get_user_by_id(
 async def update_user_by_id(
     user_id: UUID,
     body: UpdateUserRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_session),
 ) -> UpdatedUserResponse:
     target_user = await fetch_user_or_raise(user_id, current_user, session)
@@ -115,10 +146,9 @@ async def update_user_by_id(
         target_user=target_user, current_user=current_user
     ):
         AppExceptions.forbidden_exception()
-
     try:
         updated_user_id = await process_user_update_request_action(
-            user_id, body, session
+            target_user, body, session
         )
     except IntegrityError as err:
         AppExceptions.service_unavailable_exception(f"Database error: {err}")
@@ -1,14 +1,46 @@
+import datetime
 from uuid import UUID
 
 from sqlalchemy import and_
+from sqlalchemy import bindparam
+from sqlalchemy import cast
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import not_
 from sqlalchemy import select
+from sqlalchemy import Text
+from sqlalchemy import text
 from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.models import AccessToken
+from db.models import LoginLockout
+from db.models import RefreshToken
+from db.models import RevokedAccessToken
 from db.models import User
 from utils.roles import PortalRole
 
 
+# UserDAL mutations notify this channel with the user_id and email of every
+# row they change, see `UserChangeListener`
+USER_CHANGES_CHANNEL = "user_changes"
+# Revoked access tokens are announced here with their jti and exp
+TOKEN_REVOCATIONS_CHANNEL = "token_revocations"
+
+
+def _notify_user_changed():
+    """RETURNING expression that queues a notification for the changed row.
+    Postgres delivers it on commit, so it costs no extra round trip."""
+    return func.pg_notify(
+        USER_CHANGES_CHANNEL,
+        cast(
+            func.json_build_object("user_id", User.user_id, "email", User.email),
+            Text,
+        ),
+    )
+
+
 class UserDAL:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
@@ -20,24 +52,29 @@ class UserDAL:
         email: str,
         hashed_password: str,
         roles: list[PortalRole],
-    ) -> User:
-        new_user = User(
-            name=name,
-            surname=surname,
-            email=email,
-            hashed_password=hashed_password,
-            roles=roles,
+    ) -> User | None:
+        """Insert a user in one statement, None if the email is already taken."""
+        query = (
+            insert(User)
+            .values(
+                name=name,
+                surname=surname,
+                email=email,
+                hashed_password=hashed_password,
+                roles=roles,
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
         )
-        self.db_session.add(new_user)
-        await self.db_session.commit()
-        return new_user
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
 
     async def delete_user(self, user_id: UUID) -> UUID | None:
         query = (
             update(User)
             .where(and_(User.user_id == user_id, User.is_active == True))
             .values(is_active=False)
-            .returning(User.user_id)
+            .returning(User.user_id, _notify_user_changed())
         )
         res = await self.db_session.execute(query)
         deleted_user_id_row = res.fetchone()
@@ -49,15 +86,21 @@ class UserDAL:
             update(User)
             .where(and_(User.user_id == user_id, User.is_active == False))
             .values(is_active=True)
-            .returning(User.user_id)
+            .returning(User.user_id, _notify_user_changed())
         )
         res = await self.db_session.execute(query)
         activated_user_id_row = res.fetchone()
         if activated_user_id_row is not None:
             return activated_user_id_row[0]
 
-    async def get_user_by_id(self, user_id: UUID) -> User | None:
+    async def get_user_by_id(
+        self, user_id: UUID, for_update: bool = False
+    ) -> User | None:
         query = select(User).where(User.user_id == user_id)
+        if for_update:
+            # The locked row replaces one the session may have read earlier,
+            # possibly from the replica
+            query = query.with_for_update().execution_options(populate_existing=True)
         res = await self.db_session.execute(query)
         user_row = res.fetchone()
         if user_row is not None:
@@ -70,14 +113,351 @@ class UserDAL:
         if user_row is not None:
             return user_row[0]
 
-    async def update_user(self, user_id: UUID, **kwargs) -> UUID | None:
+    async def get_token_version(self, user_id: UUID) -> int | None:
+        query = select(User.token_version).where(User.user_id == user_id)
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def bump_token_version(self, user_id: UUID) -> int | None:
         query = (
             update(User)
-            .where(and_(User.user_id == user_id, User.is_active == True))
+            .where(User.user_id == user_id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.token_version, _notify_user_changed())
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def update_user(
+        self, user_id: UUID, if_matches: dict | None = None, **kwargs
+    ) -> UUID | None:
+        """Update an active user. With `if_matches` only while those columns
+        still hold the given values, None otherwise."""
+        guards = [
+            getattr(User, column) == value
+            for column, value in (if_matches or {}).items()
+        ]
+        query = (
+            update(User)
+            .where(and_(User.user_id == user_id, User.is_active == True, *guards))
             .values(kwargs)
-            .returning(User.user_id)
+            .returning(User.user_id, _notify_user_changed())
         )
         res = await self.db_session.execute(query)
         update_user_id_row = res.fetchone()
         if update_user_id_row is not None:
             return update_user_id_row[0]
+
+    async def add_role(
+        self, user_id: UUID, role: PortalRole, unless_any: tuple[PortalRole, ...] = ()
+    ) -> UUID | None:
+        """Append `role` and bump `token_version` in one statement. Nothing is
+        changed and None returned if the user is missing or inactive, already
+        has `role` or has any of `unless_any`."""
+        query = (
+            update(User)
+            .where(
+                and_(
+                    User.user_id == user_id,
+                    User.is_active == True,
+                    *(not_(User.roles.any(guard)) for guard in (role, *unless_any)),
+                )
+            )
+            .values(
+                roles=func.array_append(User.roles, role),
+                token_version=User.token_version + 1,
+            )
+            .returning(User.user_id, _notify_user_changed())
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def remove_role(self, user_id: UUID, role: PortalRole) -> UUID | None:
+        """Remove `role` and bump `token_version` in one statement, None if the
+        user is missing, inactive or doesn't have `role`."""
+        query = (
+            update(User)
+            .where(
+                and_(
+                    User.user_id == user_id,
+                    User.is_active == True,
+                    User.roles.any(role),
+                )
+            )
+            .values(
+                roles=func.array_remove(User.roles, role),
+                token_version=User.token_version + 1,
+            )
+            .returning(User.user_id, _notify_user_changed())
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def update_hashed_passwords(self, rehashed: list[dict]) -> None:
+        """Batch-replace password hashes, skipping rows whose hash has changed
+        since it was read. Items hold `user_id`, `old_hash` and `new_hash`."""
+        users = User.__table__
+        query = (
+            update(users)
+            .where(
+                and_(
+                    users.c.user_id == bindparam("b_user_id"),
+                    users.c.hashed_password == bindparam("b_old_hash"),
+                )
+            )
+            .values(hashed_password=bindparam("b_new_hash"))
+        )
+        await self.db_session.execute(
+            query,
+            [
+                {
+                    "b_user_id": item["user_id"],
+                    "b_old_hash": item["old_hash"],
+                    "b_new_hash": item["new_hash"],
+                }
+                for item in rehashed
+            ],
+        )
+
+
+class LoginLockoutDAL:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def get_updated_since(
+        self, updated_since: datetime.datetime
+    ) -> list[LoginLockout]:
+        query = select(LoginLockout).where(LoginLockout.updated_at >= updated_since)
+        res = await self.db_session.execute(query)
+        return list(res.scalars())
+
+    async def upsert(
+        self,
+        email: str,
+        failures: int,
+        locked_until: datetime.datetime | None,
+        updated_at: datetime.datetime,
+    ) -> None:
+        values = {
+            "failures": failures,
+            "locked_until": locked_until,
+            "updated_at": updated_at,
+        }
+        query = (
+            insert(LoginLockout)
+            .values(email=email, **values)
+            .on_conflict_do_update(index_elements=[LoginLockout.email], set_=values)
+        )
+        await self.db_session.execute(query)
+
+    async def delete(self, email: str) -> None:
+        query = delete(LoginLockout).where(LoginLockout.email == email)
+        await self.db_session.execute(query)
+
+
+# Rows outside the daily partitions of `refresh_tokens` end up here
+REFRESH_TOKENS_DEFAULT_PARTITION = f"{RefreshToken.__tablename__}_default"
+
+
+class RefreshTokenDAL:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def create(
+        self,
+        jti: UUID,
+        family_id: UUID,
+        user_id: UUID,
+        expires_at: datetime.datetime,
+    ) -> None:
+        query = insert(RefreshToken).values(
+            jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at
+        )
+        await self.db_session.execute(query)
+
+    async def consume(
+        self, jti: UUID, expires_at: datetime.datetime, used_at: datetime.datetime
+    ) -> UUID | None:
+        """Mark an unused, unrevoked token as used and return its family id."""
+        query = (
+            update(RefreshToken)
+            .where(
+                and_(
+                    RefreshToken.jti == jti,
+                    RefreshToken.expires_at == expires_at,
+                    RefreshToken.used_at.is_(None),
+                    RefreshToken.revoked == False,
+                )
+            )
+            .values(used_at=used_at)
+            .returning(RefreshToken.family_id)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def is_active(self, jti: UUID, expires_at: datetime.datetime) -> bool:
+        query = select(RefreshToken.jti).where(
+            and_(
+                RefreshToken.jti == jti,
+                RefreshToken.expires_at == expires_at,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked == False,
+            )
+        )
+        res = await self.db_session.execute(query)
+        return res.first() is not None
+
+    async def revoke_family(self, family_id: UUID, user_id: UUID | None = None) -> bool:
+        """Revoke the family, with `user_id` only if it belongs to that user.
+        True if any token was revoked."""
+        conditions = [
+            RefreshToken.family_id == family_id,
+            RefreshToken.revoked == False,
+        ]
+        if user_id is not None:
+            conditions.append(RefreshToken.user_id == user_id)
+        query = update(RefreshToken).where(and_(*conditions)).values(revoked=True)
+        res = await self.db_session.execute(query)
+        return res.rowcount > 0
+
+    async def get_partitions(self) -> list[str]:
+        query = text(
+            """SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table"""
+        )
+        res = await self.db_session.execute(
+            query, {"table": RefreshToken.__tablename__}
+        )
+        return list(res.scalars())
+
+    async def create_partition(
+        self, name: str, start: datetime.datetime, end: datetime.datetime
+    ) -> None:
+        """Create the partition for `[start, end)` and move the rows of that
+        range out of the default partition into it.
+
+        Postgres refuses to create a partition while the default partition
+        holds rows of its range. The table is locked against writes so none
+        can land there in between. Run it in a transaction of its own.
+        """
+        table = RefreshToken.__tablename__
+        bounds = {"start": start, "end": end}
+        await self.db_session.execute(
+            text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        )
+        await self.db_session.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {name}_moved ON COMMIT DROP AS "
+                f"WITH moved AS (DELETE FROM {REFRESH_TOKENS_DEFAULT_PARTITION} "
+                "WHERE expires_at >= :start AND expires_at < :end RETURNING *) "
+                "SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        await self.db_session.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES "
+                f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        await self.db_session.execute(
+            text(f"INSERT INTO {table} SELECT * FROM {name}_moved")
+        )
+
+    async def delete_expired_from_default(self, before: datetime.datetime) -> None:
+        await self.db_session.execute(
+            text(
+                f"DELETE FROM {REFRESH_TOKENS_DEFAULT_PARTITION} "
+                "WHERE expires_at < :before"
+            ),
+            {"before": before},
+        )
+
+    async def drop_partition(self, name: str) -> None:
+        await self.db_session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+
+class AccessTokenDAL:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def create(
+        self,
+        token_hash: bytes,
+        user_id: UUID,
+        email: str,
+        roles: list[str],
+        token_version: int,
+        expires_at: datetime.datetime,
+    ) -> None:
+        query = insert(AccessToken).values(
+            token_hash=token_hash,
+            user_id=user_id,
+            email=email,
+            roles=roles,
+            token_version=token_version,
+            expires_at=expires_at,
+        )
+        await self.db_session.execute(query)
+
+    async def get_active(
+        self, token_hash: bytes, now: datetime.datetime
+    ) -> AccessToken | None:
+        query = select(AccessToken).where(
+            and_(AccessToken.token_hash == token_hash, AccessToken.expires_at > now)
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar_one_or_none()
+
+    async def delete(self, token_hash: bytes) -> None:
+        query = delete(AccessToken).where(AccessToken.token_hash == token_hash)
+        await self.db_session.execute(query)
+
+    async def delete_expired(self, now: datetime.datetime) -> int:
+        query = delete(AccessToken).where(AccessToken.expires_at <= now)
+        res = await self.db_session.execute(query)
+        return res.rowcount
+
+
+class RevokedAccessTokenDAL:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def create(self, jti: str, expires_at: datetime.datetime) -> None:
+        """Store the revocation and notify `TOKEN_REVOCATIONS_CHANNEL` on commit."""
+        query = (
+            insert(RevokedAccessToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedAccessToken.jti])
+            .returning(
+                func.pg_notify(
+                    TOKEN_REVOCATIONS_CHANNEL,
+                    cast(
+                        func.json_build_object(
+                            "jti",
+                            RevokedAccessToken.jti,
+                            "exp",
+                            func.extract("epoch", RevokedAccessToken.expires_at),
+                        ),
+                        Text,
+                    ),
+                )
+            )
+        )
+        await self.db_session.execute(query)
+
+    async def get_active(
+        self, now: datetime.datetime
+    ) -> list[tuple[str, datetime.datetime]]:
+        query = select(RevokedAccessToken.jti, RevokedAccessToken.expires_at).where(
+            RevokedAccessToken.expires_at > now
+        )
+        res = await self.db_session.execute(query)
+        return [tuple(row) for row in res.fetchall()]
+
+    async def delete_expired(self, now: datetime.datetime) -> int:
+        query = delete(RevokedAccessToken).where(RevokedAccessToken.expires_at <= now)
+        res = await self.db_session.execute(query)
+        return res.rowcount
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RoundTripCounter:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+_round_trips: ContextVar[RoundTripCounter | None] = ContextVar(
+    "db_round_trips", default=None
+)
+
+
+@contextmanager
+def track_round_trips():
+    """Count statements and transaction control sent to the DB in this context."""
+    counter = RoundTripCounter()
+    token = _round_trips.set(counter)
+    try:
+        yield counter
+    finally:
+        _round_trips.reset(token)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _round_trips.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def _count_transaction_control(conn):
+    counter = _round_trips.get()
+    # AUTOCOMMIT connections never send BEGIN/COMMIT/ROLLBACK
+    if (
+        counter is not None
+        and conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT"
+    ):
+        counter.count += 1
+
+
+_installed = False
+
+
+def install_round_trip_listeners():
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _count_statement)
+    for identifier in ("begin", "commit", "rollback"):
+        event.listen(Engine, identifier, _count_transaction_control)
+    _installed = True
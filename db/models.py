@@ -1,6 +1,9 @@
+import datetime
 import uuid
 
 from sqlalchemy import ARRAY
+from sqlalchemy import DateTime
+from sqlalchemy import LargeBinary
 from sqlalchemy import String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
@@ -24,6 +27,9 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(default=True)
     hashed_password: Mapped[str] = mapped_column(nullable=False)
     roles: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    token_version: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
 
     # user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # name = Column(String, nullable=False)
@@ -50,3 +56,70 @@ class User(Base):
         if self.is_admin:
             return [role for role in self.roles if role != PortalRole.ROLE_PORTAL_ADMIN]
         return self.roles
+
+
+class LoginLockout(Base):
+    __tablename__ = "login_lockouts"
+
+    email: Mapped[str] = mapped_column(primary_key=True)
+    failures: Mapped[int] = mapped_column(nullable=False)
+    locked_until: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class RefreshToken(Base):
+    """Issued refresh tokens, range partitioned by day of expiry so expired
+    tokens are removed by dropping whole partitions."""
+
+    __tablename__ = "refresh_tokens"
+    __table_args__ = {"postgresql_partition_by": "RANGE (expires_at)"}
+
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    family_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False, index=True
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False, index=True
+    )
+    used_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    revoked: Mapped[bool] = mapped_column(
+        nullable=False, default=False, server_default="false"
+    )
+
+
+class AccessToken(Base):
+    """Opaque reference access tokens, only the SHA-256 of the token is stored."""
+
+    __tablename__ = "access_tokens"
+
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False, index=True
+    )
+    email: Mapped[str] = mapped_column(nullable=False)
+    roles: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    token_version: Mapped[int] = mapped_column(nullable=False)
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+class RevokedAccessToken(Base):
+    """Ids of access tokens revoked by logout, kept until the token expires so
+    every worker can deny them, see `UserChangeListener`."""
+
+    __tablename__ = "revoked_access_tokens"
+
+    jti: Mapped[str] = mapped_column(primary_key=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
@@ -0,0 +1,69 @@
+import time
+
+from prometheus_client import Histogram
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool import QueuePool
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for a free "
+    "slot and opening new connections.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Records how long every checkout takes in `db_pool_checkout_seconds`."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.logging_name or "default").observe(
+                time.perf_counter() - started
+            )
+
+
+class PoolMetricsCollector:
+    """Reports the state of registered pools each time metrics are scraped."""
+
+    def __init__(self):
+        self._pools: dict[str, QueuePool] = {}
+
+    def register(self, name: str, pool: QueuePool):
+        self._pools[name] = pool
+
+    def collect(self):
+        size = GaugeMetricFamily(
+            "db_pool_size", "Connections kept open by the pool.", labels=["pool"]
+        )
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out",
+            "Connections currently in use.",
+            labels=["pool"],
+        )
+        idle = GaugeMetricFamily(
+            "db_pool_idle", "Open connections waiting in the pool.", labels=["pool"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow",
+            "Connections open beyond the pool size.",
+            labels=["pool"],
+        )
+        for name, pool in self._pools.items():
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            idle.add_metric([name], pool.checkedin())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield idle
+        yield overflow
+
+
+pool_metrics = PoolMetricsCollector()
+REGISTRY.register(pool_metrics)
@@ -0,0 +1,71 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.core.logging.logging_app import logger
+
+# Seconds the replica is behind, 0 once it has replayed everything received
+_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+
+
+class ReplicaMonitor:
+    """Decides whether lookups may go to the read replica.
+
+    A background task measures the replica's replication lag every
+    `interval` seconds. The replica counts as healthy while it answers and
+    lags at most `max_lag` seconds. Until the first successful check, and
+    after any failure, reads stay on the primary.
+    """
+
+    def __init__(self, engine: AsyncEngine | None, max_lag: float, interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        self.healthy = False
+        self.lag: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def check(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                self.lag = (await conn.execute(_LAG_QUERY)).scalar()
+        except Exception as exc:
+            self.mark_unhealthy(exc)
+            return False
+        healthy = self.lag is not None and self.lag <= self.max_lag
+        if self.healthy and not healthy:
+            logger.error(f"Read replica lags {self.lag}s, reading from primary")
+        self.healthy = healthy
+        return healthy
+
+    def mark_unhealthy(self, exc: Exception):
+        if self.healthy:
+            logger.error(f"Read replica unavailable, reading from primary: {exc}")
+        self.healthy = False
+
+    async def start(self):
+        if self.engine is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.healthy = False
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
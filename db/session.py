@@ -1,10 +1,134 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker
 
 from api.core.config import get_settings
+from db.pool import InstrumentedAsyncAdaptedQueuePool
+from db.pool import pool_metrics
+from db.replica import ReplicaMonitor
 
 settings = get_settings()
 
-engine = create_async_engine(settings.DATABASE_URL, future=True, echo=False)
-async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        future=True,
+        echo=False,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=name,
+    )
+    pool_metrics.register(name, engine.sync_engine.pool)
+    return engine
+
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL, "replica")
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+replica_monitor = ReplicaMonitor(
+    replica_engine,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    interval=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+)
+
+_USE_REPLICA = "use_replica"
+
+
+class RoutingSession(Session):
+    """Sends the statements of a `read_only(session, replica=True)` block to
+    the replica, everything else to the session's own bind."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get(_USE_REPLICA):
+            return replica_engine.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+async_session = sessionmaker(
+    engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+)
+
+
+@asynccontextmanager
+async def autocommit(session: AsyncSession):
+    """Run lookups or a single self-contained write without BEGIN/COMMIT
+    round trips.
+
+    Outside of a transaction the session is bound to an AUTOCOMMIT connection
+    for the block and released afterwards, inside one the block just joins it.
+    """
+    if session.in_transaction():
+        yield session
+        return
+    await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    try:
+        yield session
+    finally:
+        await session.commit()
+
+
+@asynccontextmanager
+async def read_only(session: AsyncSession, replica: bool = False):
+    """`autocommit` for lookups.
+
+    With `replica` the block reads from the replica while it is healthy, so
+    results may be up to `REPLICA_MAX_LAG_SECONDS` old. Only pass it where a
+    stale or missing row can be retried on the primary. Inside a transaction
+    the block always joins it on the primary.
+    """
+    if not replica or not replica_monitor.healthy or session.in_transaction():
+        async with autocommit(session):
+            yield session
+        return
+    session.info[_USE_REPLICA] = True
+    try:
+        await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    except (OSError, DBAPIError) as exc:
+        session.info.pop(_USE_REPLICA)
+        await session.rollback()
+        replica_monitor.mark_unhealthy(exc)
+        async with autocommit(session):
+            yield session
+        return
+    try:
+        yield session
+    finally:
+        session.info.pop(_USE_REPLICA)
+        await session.commit()
+
+
+def replica_reads_enabled() -> bool:
+    return replica_monitor.healthy
+
+
+@asynccontextmanager
+async def transaction(session: AsyncSession):
+    """`session.begin()` that joins the transaction already open on `session`,
+    so actions compose into one unit of work when a handler opened it."""
+    if session.in_transaction():
+        yield session
+        return
+    async with session.begin():
+        yield session
+
+
+def after_commit(session: AsyncSession, callback):
+    """Call `callback` once the transaction open on `session` has committed."""
+    event.listen(session.sync_session, "after_commit", lambda _: callback(), once=True)
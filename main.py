@@ -1,21 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
+from fastapi import Depends
 from fastapi import FastAPI
 from fastapi import HTTPException
+from fastapi import Request
+from starlette_exporter import handle_metrics
 
 from api.core.config import get_settings
+from api.core.dependencies import authenticate_metrics_client
 from api.core.exceptions import AppExceptions
 from api.core.exceptions import http_exception_handler
+from api.core.forward_auth import ForwardAuthMiddleware
+from api.core.logging.logging_app import logger
+from api.core.middlewares import DBRoundTripMiddleware
 from api.core.middlewares import LoggingMiddleware
 from api.routers import router
+from api.v1.auth.services.LoginLockoutTracker import login_lockout_tracker
+from api.v1.auth.services.PasswordRehashWriter import password_rehash_writer
+from api.v1.auth.services.ReferenceTokenStore import reference_token_store
+from api.v1.auth.services.RefreshTokenStore import refresh_token_store
+from api.v1.auth.services.UserChangeListener import user_change_listener
+from db.session import replica_monitor
+from utils.hashing import apply_bcrypt_rounds
+from utils.hashing import calibrate_bcrypt
+from utils.hashing import hashing_pool
 
 settings = get_settings()
 
-app = FastAPI(title="my-fastapi")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.HASHING_CALIBRATE_ON_STARTUP:
+        report = await asyncio.to_thread(
+            calibrate_bcrypt, settings.HASHING_TARGET_VERIFY_MS
+        )
+        apply_bcrypt_rounds(report.recommended_rounds)
+        logger.info(report.summary())
+    await replica_monitor.start()
+    await user_change_listener.start()
+    await login_lockout_tracker.load()
+    await password_rehash_writer.start()
+    await refresh_token_store.start()
+    if settings.ACCESS_TOKEN_MODE == "reference":
+        await reference_token_store.start()
+    yield
+    await reference_token_store.stop()
+    await refresh_token_store.stop()
+    await password_rehash_writer.stop()
+    await user_change_listener.stop()
+    await replica_monitor.stop()
+    hashing_pool.shutdown()
+
+
+app = FastAPI(title="my-fastapi", lifespan=lifespan)
+app.add_middleware(DBRoundTripMiddleware)
 app.add_middleware(LoggingMiddleware)
+# Added last so it runs first, verification never reaches LoggingMiddleware
+app.add_middleware(ForwardAuthMiddleware)
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.include_router(router)
 
 
+@app.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(authenticate_metrics_client)],
+)
+def metrics(request: Request):
+    return handle_metrics(request)
+
+
 @app.get("/")
 async def ping():
     AppExceptions.forbidden_exception()
@@ -0,0 +1,110 @@
+import argparse
+import os
+import secrets
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.core.config import get_settings
+from api.v1.auth.services.ReferenceTokenStore import token_hash
+from utils.cache import TTLCache
+from utils.roles import PortalRole
+from utils.token_backends import build_token_backend
+
+settings = get_settings()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare JWT and reference access tokens: header size, "
+        "verification latency and cache memory."
+    )
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=10000)
+    return parser.parse_args()
+
+
+def make_claims() -> dict:
+    return {
+        "sub": f"{uuid.uuid4().hex[:12]}@example.com",
+        "user_id": str(uuid.uuid4()),
+        "roles": [PortalRole.ROLE_PORTAL_USER, PortalRole.ROLE_PORTAL_ADMIN],
+        "ver": 0,
+        "jti": uuid.uuid4().hex,
+        "exp": int(time.time()) + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
+def latency_us(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def cache_memory(tokens: int, make_entry) -> float:
+    """Bytes per cached token."""
+    cache = TTLCache(maxsize=tokens, ttl=3600)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(tokens):
+        key, value = make_entry()
+        cache.set(key, value)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / tokens
+
+
+def main():
+    args = parse_args()
+    backend = build_token_backend(settings.JWT_BACKEND)
+    key = settings.SECRET_KEY_FOR_ACCESS
+    claims = make_claims()
+    jwt_token = backend.encode(claims, key, settings.ALGORITHM)
+    reference_token = secrets.token_urlsafe(settings.REFERENCE_TOKEN_BYTES)
+    reference_cache = TTLCache(maxsize=1, ttl=3600)
+    reference_cache.set(token_hash(reference_token), claims)
+
+    def jwt_entry():
+        token = backend.encode(make_claims(), key, settings.ALGORITHM)
+        return token, backend.decode(token, key, settings.ALGORITHM)
+
+    def reference_entry():
+        token = secrets.token_urlsafe(settings.REFERENCE_TOKEN_BYTES)
+        return token_hash(token), make_claims()
+
+    rows = [
+        (
+            "jwt",
+            len(f"Bearer {jwt_token}"),
+            latency_us(
+                lambda: backend.decode(jwt_token, key, settings.ALGORITHM),
+                args.iterations,
+            ),
+            cache_memory(args.tokens, jwt_entry),
+        ),
+        (
+            "reference",
+            len(f"Bearer {reference_token}"),
+            latency_us(
+                lambda: reference_cache.get(token_hash(reference_token)),
+                args.iterations,
+            ),
+            cache_memory(args.tokens, reference_entry),
+        ),
+    ]
+    print(f"{'mode':>10} {'header bytes':>13} {'verify us':>10} {'cache bytes':>12}")
+    for mode, header_size, latency, memory in rows:
+        print(f"{mode:>10} {header_size:>13} {latency:>10.2f} {memory:>12.0f}")
+    print(
+        "jwt verify is a full signature check, reference verify is a cache hit; "
+        "a reference cache miss adds one indexed DB lookup."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.core.config import get_settings
+from utils.claims import compact_access_claims
+from utils.claims import normalize_access_claims
+from utils.roles import PortalRole
+from utils.token_backends import build_token_backend
+
+settings = get_settings()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare size and decode time of full and compact access tokens."
+    )
+    parser.add_argument("--iterations", type=int, default=20000)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    backend = build_token_backend(settings.JWT_BACKEND)
+    key = settings.SECRET_KEY_FOR_ACCESS
+    user_id = uuid.uuid4()
+    roles = [PortalRole.ROLE_PORTAL_USER, PortalRole.ROLE_PORTAL_ADMIN]
+    common = {"jti": uuid.uuid4().hex, "exp": int(time.time()) + 3600}
+    profiles = {
+        "full": {
+            "sub": "nikolai.sviridov@example.com",
+            "user_id": str(user_id),
+            "roles": roles,
+            "ver": 0,
+            **common,
+        },
+        "compact": {**compact_access_claims(user_id, roles, 0), **common},
+    }
+    print(f"{'profile':>8} {'token bytes':>12} {'decode us':>10}")
+    for name, claims in profiles.items():
+        token = backend.encode(claims, key, settings.ALGORITHM)
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            normalize_access_claims(backend.decode(token, key, settings.ALGORITHM))
+        elapsed = (time.perf_counter() - started) / args.iterations * 1_000_000
+        print(f"{name:>8} {len(token):>12} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.core.config import get_settings
+from utils.token_backends import FastHMACTokenBackend
+from utils.token_backends import JoseTokenBackend
+
+settings = get_settings()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare JWT encode/decode throughput of the token backends."
+    )
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--algorithm", default="HS256")
+    return parser.parse_args()
+
+
+def measure(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    args = parse_args()
+    key = settings.SECRET_KEY_FOR_ACCESS
+    claims = {
+        "sub": "user@example.com",
+        "user_id": str(uuid.uuid4()),
+        "roles": ["user"],
+        "ver": 0,
+        "exp": int(time.time()) + 3600,
+    }
+    results = {}
+    for name, backend in (
+        ("jose", JoseTokenBackend()),
+        ("fast", FastHMACTokenBackend()),
+    ):
+        token = backend.encode(claims, key, args.algorithm)
+        results[name] = (
+            measure(
+                lambda: backend.encode(claims, key, args.algorithm), args.iterations
+            ),
+            measure(
+                lambda: backend.decode(token, key, args.algorithm), args.iterations
+            ),
+        )
+        print(
+            f"{name:>5}: encode {results[name][0]:>10.0f} tokens/s, "
+            f"decode {results[name][1]:>10.0f} tokens/s"
+        )
+    print(
+        f"speedup: encode x{results['fast'][0] / results['jose'][0]:.1f}, "
+        f"decode x{results['fast'][1] / results['jose'][1]:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
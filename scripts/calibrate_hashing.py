@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.core.config import get_settings
+from utils.hashing import calibrate_bcrypt
+
+settings = get_settings()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark bcrypt costs and recommend BCRYPT_ROUNDS."
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=settings.HASHING_TARGET_VERIFY_MS,
+        help="Target password verify latency in milliseconds.",
+    )
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--samples", type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    report = calibrate_bcrypt(
+        target_verify_ms=args.target_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        samples=args.samples,
+    )
+    print(report.summary())
+    print(f"Current BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}")
+    print(f"Set BCRYPT_ROUNDS={report.recommended_rounds} to apply the recommendation.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+
+import ecdsa
+import rsa
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+EC_CURVES = {"ES256": ecdsa.NIST256p, "ES384": ecdsa.NIST384p, "ES512": ecdsa.NIST521p}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate a signing key for asymmetric access tokens."
+    )
+    parser.add_argument("kid", help="Key id, the key is stored as <kid>.pem")
+    parser.add_argument("--algorithm", default=settings.ALGORITHM)
+    parser.add_argument("--keys-dir", default=settings.JWT_KEYS_DIR)
+    parser.add_argument("--rsa-bits", type=int, default=2048)
+    return parser.parse_args()
+
+
+def generate_pem(algorithm: str, rsa_bits: int) -> bytes:
+    if algorithm.startswith("RS"):
+        _, private_key = rsa.newkeys(rsa_bits)
+        return private_key.save_pkcs1()
+    if algorithm in EC_CURVES:
+        return ecdsa.SigningKey.generate(curve=EC_CURVES[algorithm]).to_pem()
+    raise SystemExit(f"Algorithm {algorithm} is not asymmetric.")
+
+
+def main():
+    args = parse_args()
+    os.makedirs(args.keys_dir, exist_ok=True)
+    path = os.path.join(args.keys_dir, f"{args.kid}.pem")
+    if os.path.exists(path):
+        raise SystemExit(f"{path} already exists.")
+    with open(path, "wb") as key_file:
+        key_file.write(generate_pem(args.algorithm, args.rsa_bits))
+    os.chmod(path, 0o600)
+    print(f"Key {args.kid} written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,8 +20,131 @@ SECRET_KEY_FOR_REFRESH: str = env.str(
     "SECRET_KEY_FOR_REFRESH", default="your-strong-refresh-secret-key"
 )
 ALGORITHM: str = env.str("ALGORITHM", default="HS256")
+# "fast" signs HS* tokens without python-jose, "jose" always uses python-jose
+JWT_BACKEND: str = env.str("JWT_BACKEND", default="fast")
+# Used for access tokens when ALGORITHM is RS*/ES*, refresh tokens stay HS256
+JWT_KEYS_DIR: str = env.str("JWT_KEYS_DIR", default="keys")
+JWT_ACTIVE_KID: str = env.str("JWT_ACTIVE_KID", default="")
+JWT_KEYS_RELOAD_INTERVAL_SECONDS: float = env.float(
+    "JWT_KEYS_RELOAD_INTERVAL_SECONDS", default=30.0
+)
+JWKS_MAX_AGE_SECONDS: int = env.int("JWKS_MAX_AGE_SECONDS", default=300)
 ACCESS_TOKEN_EXPIRE_MINUTES: int = env.int("ACCESS_TOKEN_EXPIRE_MINUTES", default=30)
 REFRESH_TOKEN_EXPIRE_DAYS: int = env.int("ACCESS_TOKEN_EXPIRE_MINUTES", default=10)
+REFRESH_TOKEN_CACHE_SIZE: int = env.int("REFRESH_TOKEN_CACHE_SIZE", default=100000)
+REFRESH_TOKEN_MAINTENANCE_INTERVAL_SECONDS: float = env.float(
+    "REFRESH_TOKEN_MAINTENANCE_INTERVAL_SECONDS", default=3600.0
+)
+# Accept refresh tokens issued before the token store existed and exchange them
+REFRESH_TOKEN_ALLOW_LEGACY: bool = env.bool("REFRESH_TOKEN_ALLOW_LEGACY", default=True)
+# Answered by a raw ASGI middleware for reverse proxy auth_request checks
+FORWARD_AUTH_PATH: str = env.str("FORWARD_AUTH_PATH", default="/v1/auth/verify")
+INTROSPECTION_CACHE_SIZE: int = env.int("INTROSPECTION_CACHE_SIZE", default=10000)
+INTROSPECTION_CACHE_TTL_SECONDS: float = env.float(
+    "INTROSPECTION_CACHE_TTL_SECONDS", default=5.0
+)
+INTROSPECTION_MAX_BATCH: int = env.int("INTROSPECTION_MAX_BATCH", default=100)
+# Comma separated client_id:secret pairs of the resource servers allowed to
+# introspect tokens, sent with HTTP Basic auth. Empty rejects every caller.
+INTROSPECTION_CLIENTS: str = env.str("INTROSPECTION_CLIENTS", default="")
+INTROSPECTION_RATE_LIMIT_PER_IP: int = env.int(
+    "INTROSPECTION_RATE_LIMIT_PER_IP", default=600
+)
+# "jwt" issues signed access tokens, "reference" issues opaque random tokens
+ACCESS_TOKEN_MODE: str = env.str("ACCESS_TOKEN_MODE", default="jwt")
+REFERENCE_TOKEN_BYTES: int = env.int("REFERENCE_TOKEN_BYTES", default=32)
+REFERENCE_TOKEN_CACHE_SIZE: int = env.int("REFERENCE_TOKEN_CACHE_SIZE", default=100000)
+# Revocations reach other processes once their cached claims are revalidated
+REFERENCE_TOKEN_CACHE_TTL_SECONDS: float = env.float(
+    "REFERENCE_TOKEN_CACHE_TTL_SECONDS", default=10.0
+)
+REFERENCE_TOKEN_PURGE_INTERVAL_SECONDS: float = env.float(
+    "REFERENCE_TOKEN_PURGE_INTERVAL_SECONDS", default=300.0
+)
+# "full" puts email, user_id and role names into access tokens, "compact" only
+# the user id as sub, a role bitset and short claim names
+ACCESS_TOKEN_CLAIMS: str = env.str("ACCESS_TOKEN_CLAIMS", default="full")
+# Adds an X-DB-Round-Trips response header with the statements and
+# transaction control commands each request sent to the DB
+DB_ROUND_TRIP_INSTRUMENTATION: bool = env.bool(
+    "DB_ROUND_TRIP_INSTRUMENTATION", default=False
+)
+# Connection pool of each worker, defaults are SQLAlchemy's own
+DB_POOL_SIZE: int = env.int("DB_POOL_SIZE", default=5)
+DB_MAX_OVERFLOW: int = env.int("DB_MAX_OVERFLOW", default=10)
+DB_POOL_TIMEOUT_SECONDS: float = env.float("DB_POOL_TIMEOUT_SECONDS", default=30.0)
+# -1 never recycles connections
+DB_POOL_RECYCLE_SECONDS: int = env.int("DB_POOL_RECYCLE_SECONDS", default=-1)
+DB_POOL_PRE_PING: bool = env.bool("DB_POOL_PRE_PING", default=False)
+# Comma separated client_id:secret pairs allowed to scrape /metrics with HTTP
+# Basic auth, in the format of INTROSPECTION_CLIENTS. Empty rejects everyone.
+METRICS_CLIENTS: str = env.str("METRICS_CLIENTS", default="")
+# Optional streaming replica for token verification lookups, empty disables it
+DATABASE_REPLICA_URL: str = env.str("DATABASE_REPLICA_URL", default="")
+# Replication lag above which lookups fall back to the primary
+REPLICA_MAX_LAG_SECONDS: float = env.float("REPLICA_MAX_LAG_SECONDS", default=5.0)
+REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = env.float(
+    "REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", default=5.0
+)
+# Users looked up by id or email, served stale for another
+# USER_CACHE_STALE_SECONDS while they are reloaded
+USER_CACHE_SIZE: int = env.int("USER_CACHE_SIZE", default=100000)
+USER_CACHE_TTL_SECONDS: float = env.float("USER_CACHE_TTL_SECONDS", default=30.0)
+USER_CACHE_STALE_SECONDS: float = env.float("USER_CACHE_STALE_SECONDS", default=30.0)
+# Reconnect delay and keepalive interval of the user change listener
+USER_CHANGE_LISTENER_INTERVAL_SECONDS: float = env.float(
+    "USER_CHANGE_LISTENER_INTERVAL_SECONDS", default=5.0
+)
+# Verified access token payloads cached until their expiry, 0 disables the cache
+DECODED_TOKEN_CACHE_SIZE: int = env.int("DECODED_TOKEN_CACHE_SIZE", default=10000)
+TOKEN_VERSION_CACHE_SIZE: int = env.int("TOKEN_VERSION_CACHE_SIZE", default=100000)
+TOKEN_VERSION_CACHE_TTL_SECONDS: float = env.float(
+    "TOKEN_VERSION_CACHE_TTL_SECONDS", default=30.0
+)
+
+HASHING_POOL_SIZE: int = env.int("HASHING_POOL_SIZE", default=4)
+HASHING_QUEUE_SIZE: int = env.int("HASHING_QUEUE_SIZE", default=64)
+HASHING_TIMEOUT_SECONDS: float = env.float("HASHING_TIMEOUT_SECONDS", default=5.0)
+BCRYPT_ROUNDS: int = env.int("BCRYPT_ROUNDS", default=12)
+# First scheme hashes new passwords, the rest are only verified and then rehashed.
+# argon2 requires the argon2-cffi package.
+PASSWORD_HASH_SCHEMES: str = env.str("PASSWORD_HASH_SCHEMES", default="bcrypt")
+HASHING_CALIBRATE_ON_STARTUP: bool = env.bool(
+    "HASHING_CALIBRATE_ON_STARTUP", default=False
+)
+HASHING_TARGET_VERIFY_MS: float = env.float("HASHING_TARGET_VERIFY_MS", default=250.0)
+REHASH_BATCH_SIZE: int = env.int("REHASH_BATCH_SIZE", default=100)
+REHASH_FLUSH_INTERVAL_SECONDS: float = env.float(
+    "REHASH_FLUSH_INTERVAL_SECONDS", default=1.0
+)
+REHASH_QUEUE_SIZE: int = env.int("REHASH_QUEUE_SIZE", default=10000)
+
+ADMISSION_CAPACITY: int = env.int("ADMISSION_CAPACITY", default=64)
+ADMISSION_MAX_WAITING: int = env.int("ADMISSION_MAX_WAITING", default=128)
+ADMISSION_WAIT_TIMEOUT_SECONDS: float = env.float(
+    "ADMISSION_WAIT_TIMEOUT_SECONDS", default=2.0
+)
+ADMISSION_RETRY_AFTER_SECONDS: int = env.int("ADMISSION_RETRY_AFTER_SECONDS", default=1)
+LOGIN_CONCURRENCY_LIMIT: int = env.int("LOGIN_CONCURRENCY_LIMIT", default=8)
+SIGNUP_CONCURRENCY_LIMIT: int = env.int("SIGNUP_CONCURRENCY_LIMIT", default=4)
+
+RATE_LIMIT_ENABLED: bool = env.bool("RATE_LIMIT_ENABLED", default=True)
+# "memory" keeps counters per worker, "shared" goes through a RateLimitStore
+RATE_LIMIT_BACKEND: str = env.str("RATE_LIMIT_BACKEND", default="memory")
+RATE_LIMIT_MAX_KEYS: int = env.int("RATE_LIMIT_MAX_KEYS", default=100000)
+RATE_LIMIT_WINDOW_SECONDS: int = env.int("RATE_LIMIT_WINDOW_SECONDS", default=60)
+LOGIN_RATE_LIMIT_PER_IP: int = env.int("LOGIN_RATE_LIMIT_PER_IP", default=30)
+LOGIN_RATE_LIMIT_PER_EMAIL: int = env.int("LOGIN_RATE_LIMIT_PER_EMAIL", default=10)
+SIGNUP_RATE_LIMIT_PER_IP: int = env.int("SIGNUP_RATE_LIMIT_PER_IP", default=10)
+SIGNUP_RATE_LIMIT_PER_EMAIL: int = env.int("SIGNUP_RATE_LIMIT_PER_EMAIL", default=3)
+TRUST_FORWARDED_FOR: bool = env.bool("TRUST_FORWARDED_FOR", default=False)
+
+LOGIN_LOCKOUT_THRESHOLD: int = env.int("LOGIN_LOCKOUT_THRESHOLD", default=5)
+LOGIN_LOCKOUT_BASE_SECONDS: int = env.int("LOGIN_LOCKOUT_BASE_SECONDS", default=30)
+LOGIN_LOCKOUT_MAX_SECONDS: int = env.int("LOGIN_LOCKOUT_MAX_SECONDS", default=3600)
+LOGIN_LOCKOUT_RESET_SECONDS: int = env.int("LOGIN_LOCKOUT_RESET_SECONDS", default=86400)
+LOGIN_LOCKOUT_MAX_ENTRIES: int = env.int("LOGIN_LOCKOUT_MAX_ENTRIES", default=100000)
+LOGIN_LOCKOUT_PERSIST: bool = env.bool("LOGIN_LOCKOUT_PERSIST", default=False)
 
 TEST_DATABASE_URL = env.str(
     "TEST_DATABASE_URL",
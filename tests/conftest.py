@@ -18,8 +18,17 @@ from sqlalchemy.orm import sessionmaker
 
 from api.core.config import get_settings
 from api.core.dependencies import get_session
+from api.core.rate_limit import rate_limit_backend
+from api.v1.auth.services.LoginLockoutTracker import login_lockout_tracker
+from api.v1.auth.services.ReferenceTokenStore import reference_token_store
+from api.v1.auth.services.RefreshTokenStore import refresh_token_store
+from api.v1.auth.services.TokenIntrospector import token_introspector
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.auth.services.UserCache import user_cache
 from main import app
+from utils.denylist import access_token_denylist
 from utils.hashing import Hasher
+from utils.jwt import decoded_token_cache
 from utils.jwt import JWT
 from utils.roles import PortalRole
 
@@ -31,6 +40,10 @@ LOGIN_URL = "/v1/login/"
 
 CLEAN_TABLES = [
     "users",
+    "login_lockouts",
+    "refresh_tokens",
+    "access_tokens",
+    "revoked_access_tokens",
 ]
 
 
@@ -68,6 +81,19 @@ async def clean_tables(async_session_test):
                 )
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_in_memory_state():
+    rate_limit_backend.reset()
+    login_lockout_tracker.clear()
+    refresh_token_store.clear()
+    token_version_service.cache.clear()
+    decoded_token_cache.clear()
+    access_token_denylist.clear()
+    token_introspector.cache.clear()
+    reference_token_store.cache.clear()
+    user_cache.clear()
+
+
 async def _get_test_session():
     try:
         test_engine = create_async_engine(
@@ -93,6 +119,12 @@ async def client() -> AsyncGenerator[TestClient, Any]:
         yield client
 
 
+@pytest.fixture
+def metrics_client(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_CLIENTS", "prometheus:s3cret")
+    return ("prometheus", "s3cret")
+
+
 @pytest.fixture(scope="session")
 async def asyncpg_pool():
     pool = await asyncpg.create_pool(
@@ -131,13 +163,19 @@ async def create_user_in_database(asyncpg_pool):
     return create_user_in_database
 
 
-async def create_test_jwt_token_for_user(email: str, token_type) -> str:
-    token = await JWT.create_jwt_token(data={"sub": email}, token_type=token_type)
+async def create_test_jwt_token_for_user(
+    email: str, token_type, extra_claims: dict | None = None
+) -> str:
+    token = await JWT.create_jwt_token(
+        data={"sub": email, **(extra_claims or {})}, token_type=token_type
+    )
     return token
 
 
-async def create_test_auth_headers_for_user(email: str) -> dict[str, str]:
-    access_token = await create_test_jwt_token_for_user(email, "access")
+async def create_test_auth_headers_for_user(
+    email: str, extra_claims: dict | None = None
+) -> dict[str, str]:
+    access_token = await create_test_jwt_token_for_user(email, "access", extra_claims)
     return {"Authorization": f"Bearer {access_token}"}
 
 
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from api.core.admission import AdmissionController
+from api.core.admission import AdmissionPriority
+
+
+async def test_admission_rejects_when_wait_queue_is_full():
+    controller = AdmissionController(
+        capacity=1, max_waiting=0, wait_timeout=1, retry_after=3
+    )
+    await controller.acquire("login", 1, AdmissionPriority.LOW)
+
+    with pytest.raises(HTTPException) as exc:
+        await controller.acquire("login", 1, AdmissionPriority.LOW)
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "3"}
+
+
+async def test_admission_rejects_after_wait_timeout():
+    controller = AdmissionController(
+        capacity=1, max_waiting=10, wait_timeout=0.05, retry_after=1
+    )
+    await controller.acquire("login", 1, AdmissionPriority.LOW)
+
+    with pytest.raises(HTTPException) as exc:
+        await controller.acquire("token", 1, AdmissionPriority.HIGH)
+    assert exc.value.status_code == 503
+    assert controller.in_flight == 1
+
+
+async def test_admission_prefers_high_priority_waiters():
+    controller = AdmissionController(
+        capacity=1, max_waiting=10, wait_timeout=1, retry_after=1
+    )
+    admitted = []
+
+    async def request(route: str, priority: AdmissionPriority):
+        await controller.acquire(route, 10, priority)
+        admitted.append(route)
+        controller.release(route)
+
+    await controller.acquire("login", 10, AdmissionPriority.LOW)
+    waiters = [
+        asyncio.create_task(request("login", AdmissionPriority.LOW)),
+        asyncio.create_task(request("token", AdmissionPriority.HIGH)),
+    ]
+    await asyncio.sleep(0)
+    controller.release("login")
+    await asyncio.gather(*waiters)
+
+    assert admitted == ["token", "login"]
+
+
+async def test_admission_route_limit_does_not_block_other_routes():
+    controller = AdmissionController(
+        capacity=2, max_waiting=10, wait_timeout=0.05, retry_after=1
+    )
+    await controller.acquire("login", 1, AdmissionPriority.LOW)
+
+    with pytest.raises(HTTPException):
+        await controller.acquire("login", 1, AdmissionPriority.LOW)
+    await controller.acquire("token", 2, AdmissionPriority.HIGH)
+    assert controller.route_in_flight == {"login": 1, "token": 1}
+
+
+async def test_admission_login_waiters_do_not_block_cheap_routes():
+    controller = AdmissionController(
+        capacity=64, max_waiting=4, wait_timeout=1, retry_after=1
+    )
+    for _ in range(8):
+        await controller.acquire("login", 8, AdmissionPriority.LOW)
+    waiters = [
+        asyncio.create_task(controller.acquire("login", 8, AdmissionPriority.LOW))
+        for _ in range(4)
+    ]
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException):
+        await controller.acquire("login", 8, AdmissionPriority.LOW)
+    await controller.acquire("token", 64, AdmissionPriority.HIGH)
+    assert controller.route_in_flight == {"login": 8, "token": 1}
+
+    controller.release("login")
+    await asyncio.sleep(0)
+    assert sum(waiter.done() for waiter in waiters) == 1
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
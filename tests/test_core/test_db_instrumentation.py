@@ -0,0 +1,117 @@
+from uuid import uuid4
+
+from api.core.config import get_settings
+from tests.conftest import create_test_auth_headers_for_user
+from tests.conftest import USER_URL
+from utils.roles import PortalRole
+
+settings = get_settings()
+
+
+async def test_user_lookups_skip_transaction_round_trips(
+    client, create_user_in_database, monkeypatch
+):
+    monkeypatch.setattr(settings, "DB_ROUND_TRIP_INSTRUMENTATION", True)
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    headers = await create_test_auth_headers_for_user(
+        user_data["email"],
+        {
+            "user_id": str(user_data["user_id"]),
+            "roles": [PortalRole.ROLE_PORTAL_USER],
+            "ver": 0,
+        },
+    )
+
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+
+    assert resp.status_code == 200
+    # Token version and user lookups, one SELECT each without BEGIN/COMMIT
+    assert resp.headers["X-DB-Round-Trips"] == "2"
+
+
+async def test_user_update_is_one_conditional_update(
+    client, create_user_in_database, monkeypatch
+):
+    monkeypatch.setattr(settings, "DB_ROUND_TRIP_INSTRUMENTATION", True)
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    headers = await create_test_auth_headers_for_user(
+        user_data["email"],
+        {
+            "user_id": str(user_data["user_id"]),
+            "roles": [PortalRole.ROLE_PORTAL_USER],
+            "ver": 0,
+        },
+    )
+
+    resp = client.patch(
+        f"{USER_URL}?user_id={user_data['user_id']}",
+        headers=headers,
+        json={"name": "Ivan", "old_password": user_data["password"]},
+    )
+
+    assert resp.status_code == 200
+    # Token version and user lookups, then the UPDATE guarded by the password
+    # hash and token version that were checked, no transaction is held open
+    # while bcrypt runs
+    assert resp.headers["X-DB-Round-Trips"] == "3"
+
+
+async def test_repeated_lookups_are_served_from_user_cache(
+    client, create_user_in_database, monkeypatch
+):
+    monkeypatch.setattr(settings, "DB_ROUND_TRIP_INSTRUMENTATION", True)
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    headers = await create_test_auth_headers_for_user(
+        user_data["email"],
+        {
+            "user_id": str(user_data["user_id"]),
+            "roles": [PortalRole.ROLE_PORTAL_USER],
+            "ver": 0,
+        },
+    )
+    url = f"{USER_URL}?user_id={user_data['user_id']}"
+
+    first = client.get(url, headers=headers)
+    second = client.get(url, headers=headers)
+    client.patch(
+        url,
+        headers=headers,
+        json={"name": "Ivan", "old_password": user_data["password"]},
+    )
+    after_update = client.get(url, headers=headers)
+
+    assert first.headers["X-DB-Round-Trips"] == "2"
+    assert second.headers["X-DB-Round-Trips"] == "0"
+    assert after_update.json()["name"] == "Ivan"
+    assert after_update.headers["X-DB-Round-Trips"] == "1"
+
+
+async def test_round_trips_are_not_reported_by_default(client, metrics_client):
+    resp = client.get("/metrics", auth=metrics_client)
+
+    assert resp.status_code == 200
+    assert "X-DB-Round-Trips" not in resp.headers
@@ -0,0 +1,82 @@
+from uuid import uuid4
+
+from api.core.forward_auth import ForwardAuthMiddleware
+from api.v1.auth.services.TokenVersionService import token_version_service
+from tests.conftest import create_test_auth_headers_for_user
+from utils.denylist import access_token_denylist
+from utils.roles import PortalRole
+
+VERIFY_URL = "/v1/auth/verify"
+
+
+async def test_verify_returns_identity_headers(client):
+    user_id = uuid4()
+    token_version_service.remember(user_id, 0)
+    headers = await create_test_auth_headers_for_user(
+        "lol@kek.com",
+        {"user_id": str(user_id), "roles": [PortalRole.ROLE_PORTAL_USER], "ver": 0},
+    )
+
+    resp = client.get(VERIFY_URL, headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.headers["X-User-Id"] == str(user_id)
+    assert resp.headers["X-User-Roles"] == PortalRole.ROLE_PORTAL_USER
+
+
+async def test_verify_rejects_missing_and_invalid_tokens(client):
+    assert client.get(VERIFY_URL).status_code == 401
+    resp = client.get(VERIFY_URL, headers={"Authorization": "Bearer invalid"})
+    assert resp.status_code == 401
+    assert resp.headers["WWW-Authenticate"] == "Bearer"
+    resp = client.get(VERIFY_URL, headers={"Authorization": "Bearer WzFd.e30.AAAA"})
+    assert resp.status_code == 401
+
+
+async def test_verify_rejects_revoked_tokens(client):
+    user_id = uuid4()
+    token_version_service.remember(user_id, 1)
+    claims = {"user_id": str(user_id), "roles": [PortalRole.ROLE_PORTAL_USER]}
+    outdated_headers = await create_test_auth_headers_for_user(
+        "lol@kek.com", {**claims, "ver": 0}
+    )
+    denied_headers = await create_test_auth_headers_for_user(
+        "lol@kek.com", {**claims, "ver": 1, "jti": "denied"}
+    )
+    access_token_denylist.add("denied", 2**40)
+
+    assert client.get(VERIFY_URL, headers=outdated_headers).status_code == 401
+    assert client.get(VERIFY_URL, headers=denied_headers).status_code == 401
+
+
+async def test_verify_loads_unknown_token_version_from_db(
+    async_session_test, create_user_in_database
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    headers = await create_test_auth_headers_for_user(
+        user_data["email"],
+        {
+            "user_id": str(user_data["user_id"]),
+            "roles": [PortalRole.ROLE_PORTAL_USER],
+            "ver": 0,
+        },
+    )
+    middleware = ForwardAuthMiddleware(None, session_factory=async_session_test)
+    scope = {
+        "headers": [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ]
+    }
+
+    principal = await middleware.verify(scope)
+
+    assert principal.user_id == user_data["user_id"]
+    assert user_data["user_id"] in token_version_service.cache
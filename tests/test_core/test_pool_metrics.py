@@ -0,0 +1,66 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from api.core.config import get_settings
+from db.pool import InstrumentedAsyncAdaptedQueuePool
+from db.pool import PoolMetricsCollector
+
+settings = get_settings()
+
+
+def sample(collector, metric, pool="test"):
+    for family in collector.collect():
+        if family.name == metric:
+            for s in family.samples:
+                if s.labels["pool"] == pool:
+                    return s.value
+
+
+async def test_pool_gauges_follow_checkouts():
+    engine = create_async_engine(
+        settings.TEST_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_logging_name="test",
+    )
+    collector = PoolMetricsCollector()
+    collector.register("test", engine.sync_engine.pool)
+    checkouts = (
+        REGISTRY.get_sample_value("db_pool_checkout_seconds_count", {"pool": "test"})
+        or 0
+    )
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            assert sample(collector, "db_pool_checked_out") == 2
+            assert sample(collector, "db_pool_overflow") == 1
+        assert sample(collector, "db_pool_checked_out") == 0
+        assert sample(collector, "db_pool_idle") == 1
+        assert sample(collector, "db_pool_size") == 1
+    finally:
+        await engine.dispose()
+    assert (
+        REGISTRY.get_sample_value("db_pool_checkout_seconds_count", {"pool": "test"})
+        == checkouts + 2
+    )
+
+
+async def test_metrics_endpoint_exposes_pool_state(client, metrics_client):
+    resp = client.get("/metrics", auth=metrics_client)
+
+    assert resp.status_code == 200
+    assert 'db_pool_checked_out{pool="primary"}' in resp.text
+    assert "db_pool_checkout_seconds_bucket" in resp.text
+
+
+@pytest.mark.parametrize("auth", [None, ("prometheus", "wrong"), ("other", "s3cret")])
+async def test_metrics_endpoint_requires_client_auth(client, metrics_client, auth):
+    resp = client.get("/metrics", auth=auth)
+
+    assert resp.status_code == 401
+    assert resp.headers["WWW-Authenticate"] == "Basic"
+    assert "db_pool" not in resp.text
@@ -0,0 +1,47 @@
+from api.core.rate_limit import InMemoryRateLimitBackend
+from api.core.rate_limit import LocalRateLimitStore
+from api.core.rate_limit import SharedRateLimitBackend
+
+
+async def test_in_memory_backend_limits_per_key():
+    backend = InMemoryRateLimitBackend(max_keys=100)
+
+    for _ in range(3):
+        assert await backend.hit("login:ip:1.1.1.1", limit=3, window=60) is None
+    retry_after = await backend.hit("login:ip:1.1.1.1", limit=3, window=60)
+
+    assert retry_after is not None and 0 < retry_after <= 60
+    assert await backend.hit("login:ip:2.2.2.2", limit=3, window=60) is None
+
+
+async def test_in_memory_backend_evicts_least_recent_keys():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+
+    await backend.hit("a", limit=1, window=60)
+    await backend.hit("b", limit=1, window=60)
+    await backend.hit("c", limit=1, window=60)
+
+    assert await backend.hit("a", limit=1, window=60) is None
+    assert await backend.hit("c", limit=1, window=60) is not None
+
+
+async def test_shared_backend_limits_per_key():
+    backend = SharedRateLimitBackend(LocalRateLimitStore(max_keys=100))
+
+    for _ in range(2):
+        assert await backend.hit("signup:email:lol@kek.com", 2, 60) is None
+    assert await backend.hit("signup:email:lol@kek.com", 2, 60) is not None
+    backend.reset()
+    assert await backend.hit("signup:email:lol@kek.com", 2, 60) is None
+
+
+async def test_local_store_stays_bounded():
+    store = LocalRateLimitStore(max_keys=100)
+
+    for index in range(1000):
+        await store.incr(f"login:ip:{index}", ttl=60)
+    await store.incr("login:ip:999", ttl=60)
+
+    assert len(store._values) == 100
+    assert await store.get("login:ip:0") == 0
+    assert await store.get("login:ip:999") == 2
@@ -273,3 +273,63 @@ async def test_get_another_user_error(
         headers=await create_test_auth_headers_for_user(user_who_get["email"]),
     )
     assert reps.status_code == 403
+
+
+async def test_get_user_with_claims_only_principal(client, create_user_in_database):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    admin_data = {
+        **user_data,
+        "user_id": uuid4(),
+        "email": "admin@kek.com",
+        "roles": [PortalRole.ROLE_PORTAL_USER],
+    }
+    await create_user_in_database(user_data)
+    await create_user_in_database(admin_data)
+    admin_claims = {
+        "user_id": str(admin_data["user_id"]),
+        "roles": [PortalRole.ROLE_PORTAL_USER, PortalRole.ROLE_PORTAL_ADMIN],
+    }
+    resp = client.get(
+        f"{USER_URL}?user_id={user_data['user_id']}",
+        headers=await create_test_auth_headers_for_user(
+            admin_data["email"], extra_claims=admin_claims
+        ),
+    )
+    assert resp.status_code == 200
+    assert resp.json()["user_id"] == str(user_data["user_id"])
+
+
+async def test_get_user_with_outdated_token_version(client, create_user_in_database):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    headers = await create_test_auth_headers_for_user(
+        user_data["email"],
+        extra_claims={
+            "user_id": str(user_data["user_id"]),
+            "roles": [PortalRole.ROLE_PORTAL_USER],
+        },
+    )
+    resp = client.patch(
+        f"{USER_URL}?user_id={user_data['user_id']}",
+        headers=headers,
+        json={"old_password": user_data["password"], "new_password": "Abcd12!@1"},
+    )
+    assert resp.status_code == 200
+
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+    assert resp.status_code == 401
+    assert resp.json() == {"detail": "Could not validate credentials"}
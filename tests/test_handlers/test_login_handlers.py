@@ -1,12 +1,19 @@
 from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
 
 from api.core.config import get_settings
+from api.core.rate_limit import rate_limit_backend
+from api.v1.auth.services.LoginLockoutTracker import login_lockout_tracker
+from api.v1.auth.services.LoginLockoutTracker import LoginLockoutTracker
+from api.v1.auth.services.ReferenceTokenStore import reference_token_store
 from tests.conftest import assert_token_lifetime
 from tests.conftest import create_test_jwt_token_for_user
 from tests.conftest import get_test_data_from_jwt_token
 from tests.conftest import LOGIN_URL
+from tests.conftest import USER_URL
+from utils.denylist import access_token_denylist
 from utils.roles import PortalRole
 
 settings = get_settings()
@@ -214,3 +221,395 @@ async def test_create_access_token_by_refresh_token_error(
 
     assert resp.status_code == expected_status_code
     assert resp.json() == expected_detail
+
+
+async def test_user_login_rate_limited_by_email(client, monkeypatch):
+    # Keep the account lockout out of the way of the rate limit
+    monkeypatch.setattr(
+        login_lockout_tracker, "threshold", settings.LOGIN_RATE_LIMIT_PER_EMAIL + 1
+    )
+    login_data = {"username": "lol@kek.com", "password": "Abcd12!@"}
+    for _ in range(settings.LOGIN_RATE_LIMIT_PER_EMAIL):
+        resp = client.post(f"{LOGIN_URL}", data=login_data)
+        assert resp.status_code == 401
+
+    resp = client.post(f"{LOGIN_URL}", data=login_data)
+    assert resp.status_code == 429
+    assert resp.json() == {"detail": "Too many requests, try again later."}
+    assert int(resp.headers["Retry-After"]) > 0
+
+
+async def test_user_login_locked_after_failures(client, create_user_in_database):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    wrong_login_data = {"username": user_data["email"], "password": "Abcd12!@1"}
+    for _ in range(settings.LOGIN_LOCKOUT_THRESHOLD):
+        resp = client.post(f"{LOGIN_URL}", data=wrong_login_data)
+        assert resp.status_code == 401
+
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    assert resp.status_code == 429
+    assert resp.json() == {"detail": "Account is temporarily locked, try again later."}
+    assert int(resp.headers["Retry-After"]) <= settings.LOGIN_LOCKOUT_BASE_SECONDS
+
+
+async def test_login_lockout_persisted_and_reloaded(async_session_test):
+    tracker = LoginLockoutTracker(threshold=2, base_seconds=60, persist=True)
+    for _ in range(2):
+        async with async_session_test() as session:
+            await tracker.register_failure("lol@kek.com", session)
+
+    restarted_tracker = LoginLockoutTracker(threshold=2, base_seconds=60, persist=True)
+    await restarted_tracker.load(async_session_test)
+
+    with pytest.raises(HTTPException) as exc:
+        restarted_tracker.ensure_not_locked("lol@kek.com")
+    assert exc.value.status_code == 429
+
+    async with async_session_test() as session:
+        await restarted_tracker.reset("lol@kek.com", session)
+    restarted_tracker.ensure_not_locked("lol@kek.com")
+
+
+async def test_refresh_token_rotated_and_reuse_revokes_family(
+    client, create_user_in_database
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    first_refresh_token = resp.cookies["refresh_token"]
+    client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}token", cookies={"refresh_token": first_refresh_token}
+    )
+    assert resp.status_code == 200
+    second_refresh_token = resp.cookies["refresh_token"]
+    assert second_refresh_token != first_refresh_token
+    first_payload = await get_test_data_from_jwt_token(first_refresh_token, "refresh")
+    second_payload = await get_test_data_from_jwt_token(second_refresh_token, "refresh")
+    assert second_payload["fam"] == first_payload["fam"]
+    client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}token", cookies={"refresh_token": first_refresh_token}
+    )
+    assert resp.status_code == 401
+    client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}token", cookies={"refresh_token": second_refresh_token}
+    )
+    assert resp.status_code == 401
+
+
+async def test_logout_revokes_access_and_refresh_tokens(
+    client, create_user_in_database, asyncpg_pool
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    refresh_token = resp.cookies["refresh_token"]
+    client.cookies.clear()
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+    assert resp.status_code == 200
+
+    resp = client.post(
+        f"{LOGIN_URL}logout",
+        headers=headers,
+        cookies={"refresh_token": refresh_token},
+    )
+    assert resp.status_code == 204
+    assert "refresh_token" not in resp.cookies
+    client.cookies.clear()
+    # Stored for the other workers, see UserChangeListener
+    async with asyncpg_pool.acquire() as connection:
+        assert await connection.fetchval("SELECT count(*) FROM revoked_access_tokens")
+
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+    assert resp.status_code == 401
+    resp = client.post(f"{LOGIN_URL}token", cookies={"refresh_token": refresh_token})
+    assert resp.status_code == 401
+
+
+async def test_logout_everywhere_invalidates_every_session(
+    client, create_user_in_database
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    sessions = []
+    for _ in range(2):
+        resp = client.post(
+            f"{LOGIN_URL}",
+            data={"username": user_data["email"], "password": user_data["password"]},
+        )
+        sessions.append((resp.json()["access_token"], resp.cookies["refresh_token"]))
+        client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}logout/all",
+        headers={"Authorization": f"Bearer {sessions[0][0]}"},
+    )
+    assert resp.status_code == 204
+
+    for access_token, refresh_token in sessions:
+        resp = client.get(
+            f"{USER_URL}?user_id={user_data['user_id']}",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        assert resp.status_code == 401
+        resp = client.post(
+            f"{LOGIN_URL}token", cookies={"refresh_token": refresh_token}
+        )
+        assert resp.status_code == 401
+        client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    resp = client.get(
+        f"{USER_URL}?user_id={user_data['user_id']}",
+        headers={"Authorization": f"Bearer {resp.json()['access_token']}"},
+    )
+    assert resp.status_code == 200
+
+
+async def test_logout_keeps_refresh_family_of_another_user(
+    client, create_user_in_database, monkeypatch
+):
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_CLAIMS", "compact")
+    tokens = []
+    for email in ("lol@kek.com", "other@kek.com"):
+        user_data = {
+            "user_id": uuid4(),
+            "name": "Nikolai",
+            "surname": "Sviridov",
+            "email": email,
+            "password": "Abcd12!@",
+            "is_active": True,
+        }
+        await create_user_in_database(user_data)
+        resp = client.post(
+            f"{LOGIN_URL}",
+            data={"username": email, "password": user_data["password"]},
+        )
+        tokens.append((resp.json()["access_token"], resp.cookies["refresh_token"]))
+        client.cookies.clear()
+    (access_token, _), (_, other_refresh_token) = tokens
+
+    resp = client.post(
+        f"{LOGIN_URL}logout",
+        headers={"Authorization": f"Bearer {access_token}"},
+        cookies={"refresh_token": other_refresh_token},
+    )
+    assert resp.status_code == 204
+    client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}token", cookies={"refresh_token": other_refresh_token}
+    )
+    assert resp.status_code == 200
+
+
+@pytest.fixture
+def introspection_client(monkeypatch):
+    monkeypatch.setattr(settings, "INTROSPECTION_CLIENTS", "gateway:s3cret")
+    return ("gateway", "s3cret")
+
+
+async def test_introspect_tokens(client, create_user_in_database, introspection_client):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    access_token = resp.json()["access_token"]
+    refresh_token = resp.cookies["refresh_token"]
+    client.cookies.clear()
+
+    resp = client.post(
+        f"{LOGIN_URL}introspect",
+        data={"token": access_token},
+        auth=introspection_client,
+    )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["active"] is True
+    assert result["token_type"] == "access_token"
+    assert result["sub"] == user_data["email"]
+    assert result["user_id"] == str(user_data["user_id"])
+    assert result["roles"] == [PortalRole.ROLE_PORTAL_USER]
+    assert resp.headers["Cache-Control"] == (
+        f"private, max-age={int(settings.INTROSPECTION_CACHE_TTL_SECONDS)}"
+    )
+
+    resp = client.post(
+        f"{LOGIN_URL}introspect",
+        json={"tokens": [refresh_token, "invalid"], "token_type_hint": "refresh_token"},
+        auth=introspection_client,
+    )
+    assert resp.status_code == 200
+    refresh_result, invalid_result = resp.json()["results"]
+    assert refresh_result["active"] is True
+    assert refresh_result["token_type"] == "refresh_token"
+    assert invalid_result == {"active": False}
+
+
+@pytest.mark.parametrize(
+    "request_kwargs",
+    [{"data": {}}, {"json": {"tokens": []}}, {"json": {"tokens": ["a"] * 101}}],
+)
+async def test_introspect_validation_error(
+    client, introspection_client, request_kwargs
+):
+    resp = client.post(
+        f"{LOGIN_URL}introspect", auth=introspection_client, **request_kwargs
+    )
+
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "auth", [None, ("gateway", "wrong"), ("other", "s3cret"), ("gätewäy", "s3cret")]
+)
+async def test_introspect_requires_client_authentication(
+    client, introspection_client, auth
+):
+    resp = client.post(f"{LOGIN_URL}introspect", data={"token": "a"}, auth=auth)
+
+    assert resp.status_code == 401
+    assert resp.headers["WWW-Authenticate"] == "Basic"
+
+
+async def test_introspect_rate_limited_per_ip(client, introspection_client):
+    for _ in range(settings.INTROSPECTION_RATE_LIMIT_PER_IP):
+        await rate_limit_backend.hit(
+            "introspect:ip:testclient",
+            settings.INTROSPECTION_RATE_LIMIT_PER_IP,
+            settings.RATE_LIMIT_WINDOW_SECONDS,
+        )
+
+    resp = client.post(f"{LOGIN_URL}introspect", data={"token": "a"})
+
+    assert resp.status_code == 429
+
+
+async def test_reference_access_tokens(
+    client, create_user_in_database, monkeypatch, introspection_client
+):
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_MODE", "reference")
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    access_token = resp.json()["access_token"]
+    assert "." not in access_token
+    headers = {"Authorization": f"Bearer {access_token}"}
+    client.cookies.clear()
+
+    reference_token_store.cache.clear()
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+    assert resp.status_code == 200
+    resp = client.get("/v1/auth/verify", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["X-User-Id"] == str(user_data["user_id"])
+    resp = client.post(
+        f"{LOGIN_URL}introspect",
+        data={"token": access_token},
+        auth=introspection_client,
+    )
+    assert resp.json()["active"] is True
+
+    resp = client.post(f"{LOGIN_URL}logout", headers=headers)
+    assert resp.status_code == 204
+    access_token_denylist.clear()
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+    assert resp.status_code == 401
+
+
+async def test_compact_access_token_claims(
+    client, create_user_in_database, monkeypatch
+):
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_CLAIMS", "compact")
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    resp = client.post(
+        f"{LOGIN_URL}",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    access_token = resp.json()["access_token"]
+    client.cookies.clear()
+
+    payload = await get_test_data_from_jwt_token(access_token, "access")
+    assert set(payload) == {"sub", "r", "v", "jti", "exp"}
+    assert payload["sub"] == str(user_data["user_id"])
+    assert payload["r"] == 1
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    resp = client.get(f"{USER_URL}?user_id={user_data['user_id']}", headers=headers)
+    assert resp.status_code == 200
+    resp = client.get("/v1/auth/verify", headers=headers)
+    assert resp.headers["X-User-Roles"] == PortalRole.ROLE_PORTAL_USER
@@ -2,6 +2,7 @@ from uuid import uuid4
 
 import pytest
 
+from api.v1.auth.services.TokenVersionService import token_version_service
 from tests.conftest import create_test_auth_headers_for_user
 from tests.conftest import USER_URL
 from utils.roles import PortalRole
@@ -30,6 +31,7 @@ async def test_add_admin_role_to_user_by_superadmin(
     }
     await create_user_in_database(user_data_for_promotion)
     await create_user_in_database(user_data_who_promoted)
+    token_version_service.remember(user_data_for_promotion["user_id"], 0)
 
     resp = client.patch(
         f"{USER_URL}admin_privilege/?user_id={user_data_for_promotion["user_id"]}",
@@ -47,6 +49,8 @@ async def test_add_admin_role_to_user_by_superadmin(
     updated_user_from_db = dict(updated_user_from_db[0])
     assert updated_user_from_db["user_id"] == user_data_for_promotion["user_id"]
     assert PortalRole.ROLE_PORTAL_ADMIN in updated_user_from_db["roles"]
+    assert updated_user_from_db["token_version"] == 1
+    assert user_data_for_promotion["user_id"] not in token_version_service.cache
 
 
 async def test_add_admin_role_to_user_by_superadmin_invalid_id_error(
@@ -465,3 +469,47 @@ async def test_invalid_admin_privilege_revocation(
 
     assert resp.status_code == expected_status_code
     assert resp.json() == expected_detail
+
+
+@pytest.mark.parametrize(
+    "method, roles",
+    [
+        ("patch", [PortalRole.ROLE_PORTAL_USER]),
+        ("delete", [PortalRole.ROLE_PORTAL_USER, PortalRole.ROLE_PORTAL_ADMIN]),
+    ],
+)
+async def test_admin_privilege_of_inactive_user_is_not_changed(
+    client, create_user_in_database, get_user_from_database, method, roles
+):
+    inactive_user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": False,
+        "roles": roles,
+    }
+    superadmin_data = {
+        **inactive_user_data,
+        "user_id": uuid4(),
+        "email": "lol1@kek.com",
+        "is_active": True,
+        "roles": [PortalRole.ROLE_PORTAL_SUPERADMIN],
+    }
+    await create_user_in_database(inactive_user_data)
+    await create_user_in_database(superadmin_data)
+
+    resp = client.request(
+        method,
+        f"{USER_URL}admin_privilege/?user_id={inactive_user_data['user_id']}",
+        headers=await create_test_auth_headers_for_user(superadmin_data["email"]),
+    )
+
+    assert resp.status_code == 409
+    assert resp.json() == {"detail": "User with email lol@kek.com is inactive"}
+    user_from_db = dict(
+        (await get_user_from_database(inactive_user_data["user_id"]))[0]
+    )
+    assert user_from_db["roles"] == roles
+    assert user_from_db["token_version"] == 0
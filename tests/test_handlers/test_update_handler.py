@@ -634,3 +634,38 @@ async def test_update_another_user_error(
         headers=await create_test_auth_headers_for_user(user_who_update["email"]),
     )
     assert reps.status_code == 403
+
+
+async def test_update_user_changed_meanwhile_conflict(
+    client, create_user_in_database, asyncpg_pool
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+    }
+    await create_user_in_database(user_data)
+    headers = await create_test_auth_headers_for_user(user_data["email"])
+    url = f"{USER_URL}?user_id={user_data['user_id']}"
+    assert client.get(url, headers=headers).status_code == 200
+    # Changed by another worker after this one cached the user
+    async with asyncpg_pool.acquire() as connection:
+        await connection.execute(
+            "UPDATE users SET roles = $1, token_version = token_version + 1 "
+            "WHERE user_id = $2",
+            [PortalRole.ROLE_PORTAL_USER, PortalRole.ROLE_PORTAL_ADMIN],
+            user_data["user_id"],
+        )
+
+    resp = client.patch(
+        url,
+        headers=headers,
+        json={"name": "Ivan", "old_password": user_data["password"]},
+    )
+    assert resp.status_code == 409
+    assert resp.json() == {
+        "detail": "User is inactive or was changed meanwhile, try again."
+    }
@@ -0,0 +1,75 @@
+from uuid import uuid4
+
+from passlib.context import CryptContext
+
+from api.v1.auth.services.PasswordRehashWriter import PasswordRehashWriter
+from db.models import User
+from utils.hashing import Hasher
+from utils.hashing import pwd_context
+from utils.roles import PortalRole
+
+
+async def test_rehash_writer_upgrades_outdated_hash(
+    async_session_test, create_user_in_database, get_user_from_database
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+        "roles": [PortalRole.ROLE_PORTAL_USER],
+    }
+    await create_user_in_database(user_data)
+    outdated_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(
+        user_data["password"]
+    )
+    async with async_session_test() as session:
+        async with session.begin():
+            await session.execute(
+                User.__table__.update()
+                .where(User.user_id == user_data["user_id"])
+                .values(hashed_password=outdated_hash)
+            )
+
+    verified, new_hash = await Hasher.verify_and_update_async(
+        user_data["password"], outdated_hash
+    )
+    assert verified
+    assert new_hash is not None
+
+    writer = PasswordRehashWriter(session_factory=async_session_test)
+    await writer.start()
+    writer.submit(user_data["user_id"], outdated_hash, new_hash)
+    await writer.stop()
+
+    user_from_db = dict((await get_user_from_database(user_data["user_id"]))[0])
+    assert user_from_db["hashed_password"] == new_hash
+    assert not pwd_context.needs_update(user_from_db["hashed_password"])
+
+
+async def test_rehash_writer_skips_changed_hash(
+    async_session_test, create_user_in_database, get_user_from_database
+):
+    user_data = {
+        "user_id": uuid4(),
+        "name": "Nikolai",
+        "surname": "Sviridov",
+        "email": "lol@kek.com",
+        "password": "Abcd12!@",
+        "is_active": True,
+        "roles": [PortalRole.ROLE_PORTAL_USER],
+    }
+    await create_user_in_database(user_data)
+    current_hash = dict((await get_user_from_database(user_data["user_id"]))[0])[
+        "hashed_password"
+    ]
+
+    writer = PasswordRehashWriter(session_factory=async_session_test)
+    await writer.start()
+    writer.submit(user_data["user_id"], "stale-hash", "new-hash")
+    await writer.stop()
+
+    user_from_db = dict((await get_user_from_database(user_data["user_id"]))[0])
+    assert user_from_db["hashed_password"] == current_hash
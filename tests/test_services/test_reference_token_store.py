@@ -0,0 +1,32 @@
+import asyncio
+from uuid import uuid4
+
+from api.v1.auth.services.ReferenceTokenStore import ReferenceTokenStore
+from db.models import User
+from utils.roles import PortalRole
+
+
+async def test_revocation_reaches_other_processes_after_revalidation(
+    async_session_test,
+):
+    user = User(
+        user_id=uuid4(),
+        email="lol@kek.com",
+        roles=[PortalRole.ROLE_PORTAL_USER],
+        token_version=0,
+    )
+    issuer = ReferenceTokenStore(session_factory=async_session_test)
+    other = ReferenceTokenStore(
+        session_factory=async_session_test, revalidate_after=0.1
+    )
+
+    async with async_session_test() as session:
+        token = await issuer.issue(user, session)
+        assert (await other.resolve(token, session))["user_id"] == str(user.user_id)
+
+        await issuer.revoke(token, session)
+        assert await issuer.resolve(token, session) is None
+        assert other.cached(token) is not None
+
+        await asyncio.sleep(0.1)
+        assert await other.resolve(token, session) is None
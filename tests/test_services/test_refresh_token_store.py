@@ -0,0 +1,81 @@
+import datetime
+import uuid
+
+import sqlalchemy
+
+from api.v1.auth.services.RefreshTokenStore import PARTITION_PREFIX
+from api.v1.auth.services.RefreshTokenStore import RefreshTokenStore
+from db.dals import RefreshTokenDAL
+
+
+async def test_maintenance_creates_upcoming_and_drops_expired_partitions(
+    async_session_test,
+):
+    today = datetime.datetime.now(datetime.timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    expired_day = today - datetime.timedelta(days=3)
+    expired_partition = f"{PARTITION_PREFIX}{expired_day:%Y%m%d}"
+    async with async_session_test() as session:
+        async with session.begin():
+            await RefreshTokenDAL(session).create_partition(
+                expired_partition, expired_day, expired_day + datetime.timedelta(days=1)
+            )
+
+    store = RefreshTokenStore(session_factory=async_session_test, lifetime_days=2)
+    await store.maintain()
+
+    async with async_session_test() as session:
+        async with session.begin():
+            partitions = set(await RefreshTokenDAL(session).get_partitions())
+    expected = {
+        f"{PARTITION_PREFIX}{today + datetime.timedelta(days=days):%Y%m%d}"
+        for days in range(4)
+    }
+    assert expected <= partitions
+    assert expired_partition not in partitions
+
+    async with async_session_test() as session:
+        async with session.begin():
+            for name in expected:
+                await RefreshTokenDAL(session).drop_partition(name)
+
+
+async def test_maintenance_moves_tokens_out_of_the_default_partition(
+    async_session_test,
+):
+    today = datetime.datetime.now(datetime.timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    day = today + datetime.timedelta(days=1)
+    partition = f"{PARTITION_PREFIX}{day:%Y%m%d}"
+    jti = uuid.uuid4()
+    async with async_session_test() as session:
+        async with session.begin():
+            dal = RefreshTokenDAL(session)
+            await dal.drop_partition(partition)
+            # Issued while the day had no partition yet, and an expired leftover
+            for token_id, expires_at in (
+                (jti, day + datetime.timedelta(hours=1)),
+                (uuid.uuid4(), today - datetime.timedelta(days=2)),
+            ):
+                await dal.create(
+                    jti=token_id,
+                    family_id=uuid.uuid4(),
+                    user_id=uuid.uuid4(),
+                    expires_at=expires_at,
+                )
+
+    store = RefreshTokenStore(session_factory=async_session_test, lifetime_days=2)
+    await store.maintain()
+
+    async with async_session_test() as session:
+        async with session.begin():
+            rows = (
+                await session.execute(
+                    sqlalchemy.text(
+                        "SELECT jti, tableoid::regclass::text FROM refresh_tokens"
+                    )
+                )
+            ).all()
+    assert rows == [(jti, partition)]
@@ -0,0 +1,85 @@
+import asyncio
+from uuid import uuid4
+
+import sqlalchemy
+
+from api.v1.auth.services.UserCache import UserCache
+from db.dals import UserDAL
+
+USER = {
+    "user_id": uuid4(),
+    "name": "Nikolai",
+    "surname": "Sviridov",
+    "email": "lol@kek.com",
+    "password": "Abcd12!@",
+    "is_active": True,
+}
+
+
+async def rename(session_factory, name: str):
+    async with session_factory() as session:
+        async with session.begin():
+            await session.execute(
+                sqlalchemy.text("UPDATE users SET name = :name WHERE user_id = :id"),
+                {"name": name, "id": USER["user_id"]},
+            )
+
+
+async def test_lookups_by_id_and_email_share_one_entry(
+    async_session_test, create_user_in_database
+):
+    await create_user_in_database(USER)
+    cache = UserCache(session_factory=async_session_test, maxsize=10, ttl=60)
+
+    async with async_session_test() as session:
+        first = await cache.get_by_id(USER["user_id"], session)
+        await rename(async_session_test, "Renamed")
+        by_id = await cache.get_by_id(USER["user_id"], session)
+        by_email = await cache.get_by_email(USER["email"], session)
+
+    assert first.name == by_id.name == by_email.name == USER["name"]
+    assert by_id is not by_email
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate == 2 / 3
+
+
+async def test_forget_evicts_and_drops_loads_started_before_it(
+    async_session_test, create_user_in_database
+):
+    await create_user_in_database(USER)
+    cache = UserCache(session_factory=async_session_test, maxsize=10, ttl=60)
+
+    async with async_session_test() as session:
+        await cache.get_by_email(USER["email"], session)
+        await rename(async_session_test, "Renamed")
+        cache.forget(USER["user_id"])
+        renamed = await cache.get_by_email(USER["email"], session)
+
+        epoch = cache._epoch
+        loaded = await UserDAL(session).get_user_by_id(USER["user_id"])
+        cache.forget(USER["user_id"])
+        cache._store(loaded, epoch)
+        await cache.get_by_id(USER["user_id"], session)
+
+    assert renamed.name == "Renamed"
+    assert cache.misses == 3
+
+
+async def test_stale_entry_is_served_while_reloaded(
+    async_session_test, create_user_in_database
+):
+    await create_user_in_database(USER)
+    cache = UserCache(
+        session_factory=async_session_test, maxsize=10, ttl=0, stale_ttl=60
+    )
+
+    async with async_session_test() as session:
+        await cache.get_by_id(USER["user_id"], session)
+        await rename(async_session_test, "Renamed")
+        stale = await cache.get_by_id(USER["user_id"], session)
+        await asyncio.gather(*cache._refreshing.values())
+        reloaded = await cache.get_by_id(USER["user_id"], session)
+
+    assert stale.name == USER["name"]
+    assert reloaded.name == "Renamed"
+    assert (cache.stale_hits, cache.misses) == (2, 1)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from api.core.config import get_settings
+from api.v1.auth.services.TokenVersionService import token_version_service
+from api.v1.auth.services.UserCache import user_cache
+from api.v1.auth.services.UserChangeListener import UserChangeListener
+from db.dals import RevokedAccessTokenDAL
+from db.dals import UserDAL
+from utils.denylist import access_token_denylist
+from utils.timestamps import to_datetime
+
+settings = get_settings()
+
+USER = {
+    "user_id": uuid4(),
+    "name": "Nikolai",
+    "surname": "Sviridov",
+    "email": "lol@kek.com",
+    "password": "Abcd12!@",
+    "is_active": True,
+}
+
+
+async def wait_for(condition, timeout: float = 5):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def test_changes_committed_elsewhere_evict_cached_user(
+    async_session_test, create_user_in_database
+):
+    await create_user_in_database(USER)
+    listener = UserChangeListener(
+        dsn=settings.TEST_DATABASE_URL.replace("+asyncpg", ""),
+        interval=1,
+        session_factory=async_session_test,
+    )
+    await listener.start()
+    try:
+        await wait_for(lambda: listener.listening)
+        async with async_session_test() as session:
+            await user_cache.get_by_id(USER["user_id"], session)
+            token_version_service.remember(USER["user_id"], 0)
+            async with session.begin():
+                await UserDAL(session).update_user(USER["user_id"], name="Ivan")
+                await asyncio.sleep(0.1)
+                # Nothing is sent before the transaction commits
+                assert USER["user_id"] in user_cache._users
+
+        await wait_for(lambda: USER["user_id"] not in user_cache._users)
+        assert token_version_service.cache.get(USER["user_id"]) is None
+    finally:
+        await listener.stop()
+    assert listener.listening is False
+
+
+async def test_malformed_notifications_are_ignored():
+    listener = UserChangeListener(dsn="postgresql://unused", interval=1)
+
+    listener._on_notification(None, 0, "user_changes", "not json")
+    listener._on_notification(None, 0, "user_changes", '{"user_id": "nope"}')
+    listener._on_revocation(None, 0, "token_revocations", '{"jti": "x"}')
+    assert len(access_token_denylist) == 0
+
+
+async def revoke(session_factory, jti: str, exp: float):
+    async with session_factory() as session:
+        async with session.begin():
+            await RevokedAccessTokenDAL(session).create(jti, to_datetime(exp))
+
+
+async def test_revoked_access_tokens_are_denied_on_every_worker(async_session_test):
+    exp = time.time() + 60
+    await revoke(async_session_test, "before-start", exp)
+    await revoke(async_session_test, "expired", time.time() - 1)
+    listener = UserChangeListener(
+        dsn=settings.TEST_DATABASE_URL.replace("+asyncpg", ""),
+        interval=1,
+        session_factory=async_session_test,
+    )
+    await listener.start()
+    try:
+        await wait_for(lambda: listener.listening)
+        # Revocations made before the worker listened are loaded on connect
+        assert "before-start" in access_token_denylist
+        assert "expired" not in access_token_denylist
+
+        await revoke(async_session_test, "after-start", exp)
+        await wait_for(lambda: "after-start" in access_token_denylist)
+    finally:
+        await listener.stop()
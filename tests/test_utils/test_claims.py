@@ -0,0 +1,40 @@
+from uuid import uuid4
+
+from utils.claims import compact_access_claims
+from utils.claims import decode_roles
+from utils.claims import encode_roles
+from utils.claims import normalize_access_claims
+from utils.roles import PortalRole
+
+
+def test_roles_round_trip_through_bitset():
+    roles = [PortalRole.ROLE_PORTAL_USER, PortalRole.ROLE_PORTAL_SUPERADMIN]
+
+    bits = encode_roles(roles)
+
+    assert bits == 0b101
+    assert decode_roles(bits) == roles
+
+
+def test_compact_claims_normalized_to_full_profile():
+    user_id = uuid4()
+    payload = {
+        **compact_access_claims(user_id, [PortalRole.ROLE_PORTAL_ADMIN], 3),
+        "jti": "jti",
+        "exp": 123,
+    }
+
+    assert normalize_access_claims(payload) == {
+        "sub": None,
+        "user_id": str(user_id),
+        "roles": [PortalRole.ROLE_PORTAL_ADMIN],
+        "ver": 3,
+        "jti": "jti",
+        "exp": 123,
+    }
+
+
+def test_full_claims_are_left_untouched():
+    payload = {"sub": "lol@kek.com", "roles": [PortalRole.ROLE_PORTAL_USER]}
+
+    assert normalize_access_claims(payload) is payload
@@ -0,0 +1,43 @@
+import time
+
+from utils.denylist import TimingWheelDenylist
+
+
+def test_entry_denied_until_it_expires(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    denylist = TimingWheelDenylist(horizon=60)
+
+    denylist.add("jti", now + 30)
+    assert "jti" in denylist
+    assert "other" not in denylist
+
+    now += 31
+    assert "jti" not in denylist
+
+
+def test_expired_entries_are_evicted_by_the_wheel(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    denylist = TimingWheelDenylist(horizon=10)
+    for index in range(5):
+        denylist.add(f"short-{index}", now + 5)
+    # Lives longer than one turn of the wheel
+    denylist.add("long", now + 25)
+
+    now += 7
+    denylist.add("new", now + 5)
+    assert len(denylist) == 2
+    assert "long" in denylist
+
+    now += 30
+    denylist.add("latest", now + 1)
+    assert len(denylist) == 1
+
+
+def test_already_expired_entry_is_ignored():
+    denylist = TimingWheelDenylist(horizon=10)
+
+    denylist.add("jti", time.time() - 1)
+
+    assert len(denylist) == 0
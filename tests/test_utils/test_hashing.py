@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from utils.hashing import apply_bcrypt_rounds
+from utils.hashing import calibrate_bcrypt
+from utils.hashing import Hasher
+from utils.hashing import HashingPool
+from utils.hashing import pwd_context
+from utils.hashing import settings
+
+
+async def test_async_hash_and_verify():
+    hashed_password = await Hasher.get_password_hash_async("Abcd12!@")
+
+    assert await Hasher.verify_password_async("Abcd12!@", hashed_password)
+    assert not await Hasher.verify_password_async("Abcd12!@1", hashed_password)
+
+
+async def test_hashing_pool_rejects_when_queue_is_full():
+    pool = HashingPool(max_workers=1, max_pending=1, timeout=5)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def blocking_job():
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+
+    running_job = asyncio.create_task(pool.run(blocking_job))
+    await asyncio.sleep(0.1)
+
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(Hasher.get_password_hash, "Abcd12!@")
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "1"}
+
+    release.set()
+    await running_job
+    pool.shutdown()
+
+
+async def test_hashing_pool_timeout():
+    pool = HashingPool(max_workers=1, max_pending=2, timeout=0.01)
+
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(Hasher.get_password_hash, "Abcd12!@")
+    assert exc.value.status_code == 503
+    pool.shutdown()
+
+
+def test_calibrate_bcrypt_recommends_rounds_within_target():
+    report = calibrate_bcrypt(target_verify_ms=1000, min_rounds=4, max_rounds=6)
+
+    assert [item.rounds for item in report.benchmarks] == [4, 5, 6]
+    assert report.recommended_rounds == 6
+    assert report.recommended.logins_per_second_per_core > 0
+
+
+def test_calibrate_bcrypt_falls_back_to_cheapest_rounds():
+    report = calibrate_bcrypt(target_verify_ms=0.001, min_rounds=4, max_rounds=6)
+
+    assert [item.rounds for item in report.benchmarks] == [4]
+    assert report.recommended_rounds == 4
+
+
+def test_workers_with_different_rounds_do_not_rehash_each_other(monkeypatch):
+    configured_rounds = settings.BCRYPT_ROUNDS
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    hashes = {
+        rounds: CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash("Abcd12!@")
+        for rounds in (4, 5)
+    }
+    try:
+        for worker_rounds in (4, 5):
+            apply_bcrypt_rounds(worker_rounds)
+            assert not any(pwd_context.needs_update(item) for item in hashes.values())
+    finally:
+        pwd_context.update(
+            bcrypt__default_rounds=configured_rounds,
+            bcrypt__min_rounds=configured_rounds,
+        )
@@ -0,0 +1,50 @@
+import datetime
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from utils.jwt import decoded_token_cache
+from utils.jwt import JWT
+
+
+async def test_decoded_access_token_is_cached():
+    token = await JWT.create_jwt_token({"sub": "lol@kek.com"}, "access")
+
+    first = await JWT.decode_jwt_token(token, "access")
+    second = await JWT.decode_jwt_token(token, "access")
+
+    assert first == second
+    assert decoded_token_cache.misses == 1
+    assert decoded_token_cache.hits == 1
+
+
+async def test_cached_token_expires_with_exp(monkeypatch):
+    token = await JWT.create_jwt_token(
+        {"sub": "lol@kek.com"}, "access", datetime.timedelta(seconds=5)
+    )
+    await JWT.decode_jwt_token(token, "access")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+
+    with pytest.raises(HTTPException) as exc:
+        await JWT.decode_jwt_token(token, "access")
+    assert exc.value.status_code == 401
+    assert len(decoded_token_cache) == 0
+
+
+async def test_forget_token_drops_cached_payload():
+    token = await JWT.create_jwt_token({"sub": "lol@kek.com"}, "access")
+    await JWT.decode_jwt_token(token, "access")
+
+    JWT.forget_token(token)
+
+    assert len(decoded_token_cache) == 0
+
+
+async def test_refresh_tokens_are_not_cached():
+    token = await JWT.create_jwt_token({"sub": "lol@kek.com"}, "refresh")
+
+    await JWT.decode_jwt_token(token, "refresh")
+
+    assert len(decoded_token_cache) == 0
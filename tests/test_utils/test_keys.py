@@ -0,0 +1,75 @@
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from scripts.generate_jwt_key import generate_pem
+from utils.jwt import JWT
+from utils.keys import KeyRing
+
+
+def write_key(keys_dir, kid: str, algorithm: str = "RS256"):
+    (keys_dir / f"{kid}.pem").write_bytes(generate_pem(algorithm, rsa_bits=1024))
+
+
+@pytest.fixture
+def asymmetric_key_ring(tmp_path, monkeypatch):
+    write_key(tmp_path, "k1")
+    ring = KeyRing(str(tmp_path), "k1", "RS256", reload_interval=0)
+    monkeypatch.setattr("utils.jwt.ASYMMETRIC_ACCESS_TOKENS", True)
+    monkeypatch.setattr("utils.jwt.key_ring", ring)
+    monkeypatch.setattr("api.v1.auth.handlers.ASYMMETRIC_ACCESS_TOKENS", True)
+    monkeypatch.setattr("api.v1.auth.handlers.key_ring", ring)
+    return ring
+
+
+async def test_access_token_signed_with_active_kid(asymmetric_key_ring):
+    token = await JWT.create_jwt_token({"sub": "lol@kek.com"}, "access")
+
+    assert jwt.get_unverified_header(token) == {
+        "alg": "RS256",
+        "kid": "k1",
+        "typ": "JWT",
+    }
+    payload = await JWT.decode_jwt_token(token, "access")
+    assert payload["sub"] == "lol@kek.com"
+
+
+async def test_key_rotation_keeps_old_tokens_valid(asymmetric_key_ring, tmp_path):
+    old_token = await JWT.create_jwt_token({"sub": "lol@kek.com"}, "access")
+    write_key(tmp_path, "k2")
+    asymmetric_key_ring.load()
+    asymmetric_key_ring.active_kid = "k2"
+
+    new_token = await JWT.create_jwt_token({"sub": "lol@kek.com"}, "access")
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+    assert (await JWT.decode_jwt_token(old_token, "access"))["sub"] == "lol@kek.com"
+    assert (await JWT.decode_jwt_token(new_token, "access"))["sub"] == "lol@kek.com"
+
+
+async def test_unknown_kid_rejected(asymmetric_key_ring, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    write_key(other_dir, "k9")
+    foreign_key = KeyRing(str(other_dir), "k9", "RS256", reload_interval=0).active
+    token = jwt.encode(
+        {"sub": "lol@kek.com"},
+        foreign_key.private_key,
+        algorithm="RS256",
+        headers={"kid": "k9"},
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await JWT.decode_jwt_token(token, "access")
+    assert exc.value.status_code == 401
+
+
+async def test_jwks_endpoint(client, asymmetric_key_ring):
+    resp = client.get("/.well-known/jwks.json")
+
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"].startswith("public, max-age=")
+    keys = resp.json()["keys"]
+    assert [key["kid"] for key in keys] == ["k1"]
+    assert keys[0]["kty"] == "RSA" and keys[0]["alg"] == "RS256"
+    assert "d" not in keys[0]
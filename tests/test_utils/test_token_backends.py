@@ -0,0 +1,73 @@
+import base64
+import hashlib
+import hmac
+import time
+
+import pytest
+from jose import JWTError
+
+from utils.token_backends import FastHMACTokenBackend
+from utils.token_backends import JoseTokenBackend
+
+KEY = "test-secret"
+
+
+@pytest.fixture
+def claims():
+    return {"sub": "lol@kek.com", "roles": ["user"], "exp": int(time.time()) + 60}
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+def test_fast_tokens_are_interchangeable_with_jose(claims, algorithm):
+    fast, jose = FastHMACTokenBackend(), JoseTokenBackend()
+
+    fast_token = fast.encode(claims, KEY, algorithm)
+    jose_token = jose.encode(claims, KEY, algorithm)
+
+    assert fast_token == jose_token
+    assert jose.decode(fast_token, KEY, algorithm) == claims
+    assert fast.decode(jose_token, KEY, algorithm) == claims
+
+
+@pytest.mark.parametrize("backend", [FastHMACTokenBackend(), JoseTokenBackend()])
+def test_expired_token_is_rejected(claims, backend):
+    claims["exp"] = int(time.time()) - 1
+    token = backend.encode(claims, KEY, "HS256")
+
+    with pytest.raises(JWTError):
+        backend.decode(token, KEY, "HS256")
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-a-token",
+        "a.b.c",
+        "eyJhbGciOiJub25lIiwidHlwIjoiSldUIn0.eyJzdWIiOiJ4In0.",
+        # Header and claims that are JSON but not objects
+        "WzFd.e30.AAAA",
+        "bnVsbA.e30.AAAA",
+    ],
+)
+def test_fast_backend_rejects_malformed_tokens(token):
+    with pytest.raises(JWTError):
+        FastHMACTokenBackend().decode(token, KEY, "HS256")
+
+
+def test_fast_backend_rejects_wrong_key(claims):
+    backend = FastHMACTokenBackend()
+    token = backend.encode(claims, KEY, "HS256")
+
+    with pytest.raises(JWTError):
+        backend.decode(token, "other-secret", "HS256")
+
+
+def test_fast_backend_rejects_signed_claims_that_are_not_an_object():
+    backend = FastHMACTokenBackend()
+    header = backend.encode({}, KEY, "HS256").split(".")[0].encode()
+    signing_input = header + b"." + base64.urlsafe_b64encode(b"[1]").rstrip(b"=")
+    signature = hmac.new(KEY.encode(), signing_input, hashlib.sha256).digest()
+    token = signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")
+
+    with pytest.raises(JWTError):
+        backend.decode(token.decode(), KEY, "HS256")
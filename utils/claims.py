@@ -0,0 +1,46 @@
+from utils.roles import PortalRole
+
+# Bit positions follow the definition order of PortalRole, new roles must be
+# appended there so already issued tokens keep their meaning.
+ROLE_BITS = {role: 1 << index for index, role in enumerate(PortalRole)}
+
+# Marks a compact payload: sub is the user id, r the role bitset, v the version
+COMPACT_ROLES_CLAIM = "r"
+COMPACT_VERSION_CLAIM = "v"
+
+
+def encode_roles(roles) -> int:
+    bits = 0
+    for role in roles:
+        bits |= ROLE_BITS[role]
+    return bits
+
+
+def decode_roles(bits: int) -> list[str]:
+    return [role for role, bit in ROLE_BITS.items() if bits & bit]
+
+
+def compact_access_claims(user_id, roles, token_version: int) -> dict:
+    return {
+        "sub": str(user_id),
+        COMPACT_ROLES_CLAIM: encode_roles(roles),
+        COMPACT_VERSION_CLAIM: token_version,
+    }
+
+
+def normalize_access_claims(payload: dict) -> dict:
+    """Rebuild the full claim set from a compact payload. Since compact
+    tokens don't carry the email, `sub` becomes None."""
+    bits = payload.get(COMPACT_ROLES_CLAIM)
+    if not isinstance(bits, int):
+        return payload
+    normalized = {
+        "sub": None,
+        "user_id": payload["sub"],
+        "roles": decode_roles(bits),
+        "ver": payload.get(COMPACT_VERSION_CLAIM, 0),
+        "exp": payload["exp"],
+    }
+    if "jti" in payload:
+        normalized["jti"] = payload["jti"]
+    return normalized
@@ -0,0 +1,75 @@
+import time
+from typing import Hashable
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+
+class TimingWheelDenylist:
+    """Exact set of revoked token ids, each dropped when its token expires.
+
+    Membership is a single dict lookup. Expiry is driven by a timing wheel of
+    `slots` buckets covering `resolution` seconds each, entries are placed in
+    the bucket of their expiry tick and removed once the wheel passes it, so
+    memory never holds more than the tokens that are still valid.
+    """
+
+    def __init__(self, horizon: float, resolution: float = 1.0):
+        self.resolution = resolution
+        self.slots = max(int(horizon // resolution) + 1, 1)
+        self._expires: dict[Hashable, float] = {}
+        self._wheel: list[list[Hashable]] = [[] for _ in range(self.slots)]
+        # Last tick whose bucket has been processed
+        self._tick = int(time.time() // resolution) - 1
+
+    def add(self, key: Hashable, expires_at: float):
+        now = time.time()
+        self._advance(now)
+        if expires_at <= now:
+            return
+        self._expires[key] = expires_at
+        self._wheel[int(expires_at // self.resolution) % self.slots].append(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self._expires.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def clear(self):
+        self._expires.clear()
+        for bucket in self._wheel:
+            bucket.clear()
+        self._tick = int(time.time() // self.resolution) - 1
+
+    def _advance(self, now: float):
+        # Buckets are processed once their tick is over and all entries in it
+        # have expired. A full turn visits every bucket, so more is never needed
+        last_tick = int(now // self.resolution) - 1
+        start_tick = max(self._tick + 1, last_tick - self.slots + 1)
+        for tick in range(start_tick, last_tick + 1):
+            bucket = self._wheel[tick % self.slots]
+            if not bucket:
+                continue
+            # Entries from a later turn of the wheel stay in the bucket
+            self._wheel[tick % self.slots] = [
+                key for key in bucket if self._expire(key, now)
+            ]
+        self._tick = max(self._tick, last_tick)
+
+    def _expire(self, key: Hashable, now: float) -> bool:
+        """Drop `key` if it has expired, return whether it should stay queued."""
+        expires_at = self._expires.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            del self._expires[key]
+            return False
+        return True
+
+
+access_token_denylist = TimingWheelDenylist(
+    horizon=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
@@ -1,6 +1,74 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+
+settings = get_settings()
+
+pwd_context = CryptContext(
+    schemes=settings.PASSWORD_HASH_SCHEMES.split(","),
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+CALIBRATION_PASSWORD = "Calibrate12!@"
+
+
+class HashingPool:
+    """Bounded thread pool that keeps bcrypt work off the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism here.
+    `max_pending` caps queued plus running jobs, extra callers are rejected
+    immediately instead of piling up behind the workers.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, timeout: float):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="hasher"
+            )
+        return self._executor
+
+    async def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            AppExceptions.service_unavailable_exception(
+                "Server is busy, try again later.", retry_after=1
+            )
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            AppExceptions.service_unavailable_exception(
+                "Server is busy, try again later.", retry_after=1
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    max_workers=settings.HASHING_POOL_SIZE,
+    max_pending=settings.HASHING_QUEUE_SIZE,
+    timeout=settings.HASHING_TIMEOUT_SECONDS,
+)
 
 
 class Hasher:
@@ -11,3 +79,128 @@ class Hasher:
     @staticmethod
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        return await hashing_pool.run(
+            pwd_context.verify, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        return await hashing_pool.run(pwd_context.hash, password)
+
+    @staticmethod
+    async def verify_and_update_async(
+        plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify the password and, when the stored hash uses a deprecated scheme
+        or cost, also return a replacement hash built with the current settings."""
+        return await hashing_pool.run(
+            pwd_context.verify_and_update, plain_password, hashed_password
+        )
+
+
+@dataclass
+class BcryptBenchmark:
+    rounds: int
+    hash_ms: float
+    verify_ms: float
+
+    @property
+    def logins_per_second_per_core(self) -> float:
+        return 1000 / self.verify_ms
+
+
+@dataclass
+class CalibrationReport:
+    target_verify_ms: float
+    benchmarks: list[BcryptBenchmark]
+    recommended_rounds: int
+    cores: int
+
+    @property
+    def recommended(self) -> BcryptBenchmark:
+        return next(
+            item for item in self.benchmarks if item.rounds == self.recommended_rounds
+        )
+
+    def summary(self) -> str:
+        lines = [
+            f"bcrypt calibration, target verify latency {self.target_verify_ms:.0f} ms"
+        ]
+        for item in self.benchmarks:
+            lines.append(
+                f"  rounds={item.rounds:<3} hash={item.hash_ms:8.1f} ms "
+                f"verify={item.verify_ms:8.1f} ms "
+                f"logins/s per core={item.logins_per_second_per_core:8.1f}"
+            )
+        recommended = self.recommended
+        lines.append(
+            f"recommended rounds={recommended.rounds}, "
+            f"~{recommended.logins_per_second_per_core:.1f} logins/s per core, "
+            f"~{recommended.logins_per_second_per_core * self.cores:.1f} logins/s "
+            f"on {self.cores} hashing threads"
+        )
+        return "\n".join(lines)
+
+
+def _measure_ms(func, samples: int) -> float:
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def benchmark_bcrypt(rounds: int, samples: int = 3) -> BcryptBenchmark:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed_password = context.hash(CALIBRATION_PASSWORD)
+    return BcryptBenchmark(
+        rounds=rounds,
+        hash_ms=_measure_ms(lambda: context.hash(CALIBRATION_PASSWORD), samples),
+        verify_ms=_measure_ms(
+            lambda: context.verify(CALIBRATION_PASSWORD, hashed_password), samples
+        ),
+    )
+
+
+def calibrate_bcrypt(
+    target_verify_ms: float,
+    min_rounds: int = 10,
+    max_rounds: int = 14,
+    samples: int = 3,
+) -> CalibrationReport:
+    """Benchmark bcrypt costs on this machine and pick the slowest one that
+    still verifies within `target_verify_ms`."""
+    benchmarks = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        benchmark = benchmark_bcrypt(rounds, samples)
+        benchmarks.append(benchmark)
+        if benchmark.verify_ms > target_verify_ms:
+            break
+
+    fitting = [item for item in benchmarks if item.verify_ms <= target_verify_ms]
+    recommended = (
+        max(fitting, key=lambda item: item.rounds) if fitting else benchmarks[0]
+    )
+    return CalibrationReport(
+        target_verify_ms=target_verify_ms,
+        benchmarks=benchmarks,
+        recommended_rounds=recommended.rounds,
+        cores=min(settings.HASHING_POOL_SIZE, os.cpu_count() or 1),
+    )
+
+
+def apply_bcrypt_rounds(rounds: int):
+    """Hash new passwords with `rounds` in this process.
+
+    Calibration is timing based, so workers may settle on different costs.
+    Only hashes below both `rounds` and BCRYPT_ROUNDS are rehashed, so
+    workers never keep rehashing each other's hashes.
+    """
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=min(rounds, settings.BCRYPT_ROUNDS),
+    )
@@ -1,13 +1,36 @@
 import datetime
+import hashlib
+import time
 
 from jose import jwt
 from jose import JWTError
 
 from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from utils.cache import TTLCache
+from utils.claims import normalize_access_claims
+from utils.keys import ASYMMETRIC_ALGORITHMS
+from utils.keys import key_ring
+from utils.token_backends import build_token_backend
 
 settings = get_settings()
 
+ASYMMETRIC_ACCESS_TOKENS = settings.ALGORITHM in ASYMMETRIC_ALGORITHMS
+# Refresh tokens are only ever verified by this service, so they keep a shared secret
+REFRESH_ALGORITHM = "HS256" if ASYMMETRIC_ACCESS_TOKENS else settings.ALGORITHM
+
+token_backend = build_token_backend(settings.JWT_BACKEND)
+
+# Verified access token payloads keyed by token digest, each kept until its `exp`
+decoded_token_cache = TTLCache(
+    maxsize=settings.DECODED_TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 class JWT:
 
@@ -22,23 +45,54 @@ class JWT:
             token_key = settings.SECRET_KEY_FOR_REFRESH
             token_time = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60
 
-        to_encode = data.copy()
-        expire = datetime.datetime.now(datetime.timezone.utc) + (
-            expires_delta or datetime.timedelta(minutes=token_time)
-        )
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, token_key, algorithm=settings.ALGORITHM)
+        lifetime = expires_delta or datetime.timedelta(minutes=token_time)
+        to_encode = {"exp": int(time.time() + lifetime.total_seconds()), **data}
+        if token_type == "access" and ASYMMETRIC_ACCESS_TOKENS:
+            signing_key = key_ring.active
+            return token_backend.encode(
+                to_encode,
+                signing_key.private_key,
+                algorithm=signing_key.algorithm,
+                headers={"kid": signing_key.kid},
+            )
+        if token_type == "access":
+            return token_backend.encode(to_encode, token_key, settings.ALGORITHM)
+        return token_backend.encode(to_encode, token_key, REFRESH_ALGORITHM)
 
     @staticmethod
     async def decode_jwt_token(token: str, token_type: str) -> dict[str, str]:
         if token_type == "access":
+            digest = token_digest(token)
+            payload = decoded_token_cache.get(digest)
+            if payload is not None:
+                return payload
             token_key = settings.SECRET_KEY_FOR_ACCESS
+            algorithm = settings.ALGORITHM
         else:
-            token_key = (settings.SECRET_KEY_FOR_REFRESH,)
+            token_key = settings.SECRET_KEY_FOR_REFRESH
+            algorithm = REFRESH_ALGORITHM
         try:
-            payload = jwt.decode(token, token_key, algorithms=[settings.ALGORITHM])
+            if token_type == "access" and ASYMMETRIC_ACCESS_TOKENS:
+                algorithm = key_ring.algorithm
+                token_key = key_ring.verification_key(
+                    jwt.get_unverified_header(token).get("kid")
+                )
+                if token_key is None:
+                    AppExceptions.unauthorized_exception(
+                        "Could not validate credentials"
+                    )
+            payload = token_backend.decode(token, token_key, algorithm)
             if "sub" not in payload.keys():
                 AppExceptions.unauthorized_exception("Could not validate credentials")
         except JWTError:
             AppExceptions.unauthorized_exception("Could not validate credentials")
+        if token_type == "access":
+            payload = normalize_access_claims(payload)
+        if token_type == "access" and isinstance(payload.get("exp"), int):
+            decoded_token_cache.set(digest, payload, expires_at=payload["exp"])
         return payload
+
+    @staticmethod
+    def forget_token(token: str):
+        """Drop a cached access token payload, e.g. right after revoking it."""
+        decoded_token_cache.pop(token_digest(token))
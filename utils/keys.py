@@ -0,0 +1,103 @@
+import os
+import time
+from dataclasses import dataclass
+
+from jose import jwk
+from jose.backends.base import Key
+
+from api.core.config import get_settings
+from api.core.logging.logging_app import logger
+
+settings = get_settings()
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: Key
+    public_key: Key
+    public_jwk: dict
+
+
+class KeyRing:
+    """Asymmetric access token keys loaded from `<keys_dir>/<kid>.pem`.
+
+    Every key in the directory is published in the JWKS and accepted for
+    verification, only `active_kid` signs. To rotate, add the new key file
+    first, wait until all instances and JWKS caches have seen it, switch
+    `JWT_ACTIVE_KID`, and delete the old file once its tokens have expired.
+    A token with an unknown kid triggers a (rate limited) reload, so new keys
+    are picked up without restarts.
+    """
+
+    def __init__(
+        self, keys_dir: str, active_kid: str, algorithm: str, reload_interval: float
+    ):
+        self.keys_dir = keys_dir
+        self.active_kid = active_kid
+        self.algorithm = algorithm
+        self.reload_interval = reload_interval
+        self._keys: dict[str, SigningKey] | None = None
+        self._jwks: dict | None = None
+        self._loaded_at = 0.0
+
+    @property
+    def keys(self) -> dict[str, SigningKey]:
+        if self._keys is None:
+            self.load()
+        return self._keys
+
+    @property
+    def active(self) -> SigningKey:
+        key = self.keys.get(self.active_kid)
+        if key is None:
+            raise RuntimeError(f"Signing key {self.active_kid!r} not found")
+        return key
+
+    def load(self):
+        keys = {}
+        if os.path.isdir(self.keys_dir):
+            for file_name in sorted(os.listdir(self.keys_dir)):
+                kid, extension = os.path.splitext(file_name)
+                if extension != ".pem":
+                    continue
+                with open(os.path.join(self.keys_dir, file_name), "rb") as key_file:
+                    keys[kid] = self._parse_key(kid, key_file.read())
+        self._keys = keys
+        self._jwks = {"keys": [key.public_jwk for key in keys.values()]}
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded JWT keys: {', '.join(keys) or 'none'}")
+
+    def verification_key(self, kid: str | None) -> Key | None:
+        key = self.keys.get(kid)
+        if key is None and time.monotonic() - self._loaded_at > self.reload_interval:
+            self.load()
+            key = self.keys.get(kid)
+        return key.public_key if key else None
+
+    def jwks(self) -> dict:
+        if self._jwks is None:
+            self.load()
+        return self._jwks
+
+    def _parse_key(self, kid: str, pem: bytes) -> SigningKey:
+        private_key = jwk.construct(pem, self.algorithm)
+        public_key = private_key.public_key()
+        public_jwk = {
+            **public_key.to_dict(),
+            "kid": kid,
+            "use": "sig",
+            "alg": self.algorithm,
+        }
+        return SigningKey(kid, self.algorithm, private_key, public_key, public_jwk)
+
+
+key_ring = KeyRing(
+    keys_dir=settings.JWT_KEYS_DIR,
+    active_kid=settings.JWT_ACTIVE_KID,
+    algorithm=settings.ALGORITHM,
+    reload_interval=settings.JWT_KEYS_RELOAD_INTERVAL_SECONDS,
+)
@@ -1,6 +1,7 @@
 from enum import StrEnum
 
 
+# Order matters: compact tokens encode roles as bits in definition order
 class PortalRole(StrEnum):
     ROLE_PORTAL_USER = "ROLE_PORTAL_USER"
     ROLE_PORTAL_ADMIN = "ROLE_PORTAL_ADMIN"
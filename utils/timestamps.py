@@ -0,0 +1,8 @@
+import datetime
+
+
+def to_datetime(timestamp: float | None) -> datetime.datetime | None:
+    """Aware UTC datetime for a unix timestamp, as stored in the database."""
+    if timestamp is None:
+        return None
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
@@ -0,0 +1,145 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC
+from abc import abstractmethod
+
+from jose import jwt
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError
+from jose.exceptions import JWTClaimsError
+
+HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class TokenBackend(ABC):
+    """Signs and verifies JWTs. `decode` raises `JWTError` for any invalid token."""
+
+    @abstractmethod
+    def encode(
+        self, claims: dict, key, algorithm: str, headers: dict | None = None
+    ) -> str:
+        pass
+
+    @abstractmethod
+    def decode(self, token: str, key, algorithm: str) -> dict:
+        pass
+
+
+class JoseTokenBackend(TokenBackend):
+    def encode(
+        self, claims: dict, key, algorithm: str, headers: dict | None = None
+    ) -> str:
+        return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token: str, key, algorithm: str) -> dict:
+        return jwt.decode(token, key, algorithms=[algorithm])
+
+
+class _HMACSigner:
+    __slots__ = ("header", "mac")
+
+    def __init__(self, key: str, algorithm: str):
+        header = {"alg": algorithm, "typ": "JWT"}
+        self.header = _b64encode(
+            json.dumps(header, separators=(",", ":"), sort_keys=True).encode()
+        )
+        self.mac = hmac.new(key.encode(), digestmod=HMAC_DIGESTS[algorithm])
+
+    def sign(self, signing_input: bytes) -> bytes:
+        mac = self.mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+
+class FastHMACTokenBackend(TokenBackend):
+    """HS256/384/512 fast path: the header segment is encoded once per key and
+    the keyed HMAC state is copied instead of rebuilt for every token. Other
+    algorithms and custom headers go through python-jose, tokens are
+    interchangeable between both backends."""
+
+    def __init__(self):
+        self._fallback = JoseTokenBackend()
+        self._signers: dict[tuple[str, str], _HMACSigner] = {}
+
+    def encode(
+        self, claims: dict, key, algorithm: str, headers: dict | None = None
+    ) -> str:
+        if headers or algorithm not in HMAC_DIGESTS:
+            return self._fallback.encode(claims, key, algorithm, headers)
+        signer = self._signer(key, algorithm)
+        signing_input = (
+            signer.header + b"." + _b64encode(_json_encoder.encode(claims).encode())
+        )
+        return (signing_input + b"." + _b64encode(signer.sign(signing_input))).decode()
+
+    def decode(self, token: str, key, algorithm: str) -> dict:
+        if algorithm not in HMAC_DIGESTS:
+            return self._fallback.decode(token, key, algorithm)
+        signer = self._signer(key, algorithm)
+        try:
+            header_segment, payload_segment, signature_segment = token.encode(
+                "ascii"
+            ).split(b".")
+            if header_segment != signer.header:
+                header = json.loads(_b64decode(header_segment))
+                if not isinstance(header, dict):
+                    raise JWTError("Invalid header.")
+                if header.get("alg") != algorithm or "crit" in header:
+                    raise JWTError("The specified alg value is not allowed")
+            signature = signer.sign(header_segment + b"." + payload_segment)
+            if not hmac.compare_digest(signature, _b64decode(signature_segment)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(_b64decode(payload_segment))
+        except (ValueError, UnicodeError, binascii.Error) as exc:
+            raise JWTError("Invalid token.") from exc
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload.")
+        self._validate_claims(claims)
+        return claims
+
+    @staticmethod
+    def _validate_claims(claims: dict):
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+            if exp <= now:
+                raise ExpiredSignatureError("Signature has expired.")
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+        if "aud" in claims:
+            raise JWTClaimsError("Invalid audience")
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise JWTClaimsError("Subject must be a string.")
+
+    def _signer(self, key: str, algorithm: str) -> _HMACSigner:
+        signer = self._signers.get((key, algorithm))
+        if signer is None:
+            signer = self._signers[(key, algorithm)] = _HMACSigner(key, algorithm)
+        return signer
+
+
+def build_token_backend(name: str) -> TokenBackend:
+    if name == "jose":
+        return JoseTokenBackend()
+    return FastHMACTokenBackend()